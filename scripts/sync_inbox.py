@@ -31,24 +31,22 @@ async def sync():
     
     logger.info(f"📊 Already processed {tracker.get_count()} emails")
     logger.info("🔍 Searching for new AI newsletters...")
-    newsletters = await mail_adapter.get_latest_newsletters()
-    
-    if not newsletters:
-        logger.info("📭 No new newsletters found.")
-        return
 
+    total_count = 0
     new_count = 0
     skipped_count = 0
 
-    for nl in newsletters:
+    # Stream newsletters instead of materializing the full list up front
+    async for nl in mail_adapter.iter_latest_newsletters():
+        total_count += 1
         email_id = nl['id']
-        
+
         # Skip if already processed
         if tracker.is_processed(email_id):
             logger.debug(f"⏭️  Skipping already processed: {nl['subject']}")
             skipped_count += 1
             continue
-        
+
         logger.info(f"📥 Processing NEW: {nl['subject']} from {nl['from']}")
         
         # Map Nylas keys to our process_new_email expectation
@@ -61,13 +59,28 @@ async def sync():
         }
         
         try:
-            await process_new_email(payload)
-            tracker.mark_processed(email_id)
-            new_count += 1
-            logger.info(f"✅ Successfully processed: {nl['subject']}")
+            failed = await process_new_email(payload)
         except Exception as e:
             logger.error(f"❌ Failed to process {nl['subject']}: {e}")
-    
+            continue
+
+        if failed:
+            # Leave the email unmarked so the next sync retries it —
+            # re-ingesting merges cleanly into whatever already landed
+            logger.warning(f"⚠️ {len(failed)} insights from '{nl['subject']}' were not stored; will retry next sync")
+            continue
+
+        tracker.mark_processed(email_id)
+        new_count += 1
+        logger.info(f"✅ Successfully processed: {nl['subject']}")
+
+    # Persist any batched tracker marks before reporting
+    tracker.flush()
+
+    if total_count == 0:
+        logger.info("📭 No new newsletters found.")
+        return
+
     logger.info(f"✅ Sync complete! Processed {new_count} new emails, skipped {skipped_count} already processed.")
     logger.info("🔄 Refresh your Streamlit dashboard!")
 
@@ -0,0 +1,42 @@
+"""
+Shared httpx.AsyncClient for adapters that accept an external HTTP client.
+Centralizing the connection pool (HTTP/2, keepalive) amortizes TCP + TLS
+setup across all LLM requests instead of each client owning its own pool.
+Pools are keyed by event loop: connections opened on one loop cannot be
+reused after it closes, and Streamlit's asyncio.run creates a fresh loop
+per button click.
+"""
+import asyncio
+import atexit
+
+import httpx
+
+_clients: dict = {}
+
+def shared_client() -> httpx.AsyncClient:
+    """The pooled client for the current running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # Drop pools bound to loops that have since closed
+        for stale in [l for l in _clients if l.is_closed()]:
+            del _clients[stale]
+        client = _clients[loop] = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=20,
+        )
+    return client
+
+def _close_clients():
+    """Best-effort close at interpreter exit so connections aren't leaked."""
+    for client in list(_clients.values()):
+        if client.is_closed:
+            continue
+        try:
+            asyncio.run(client.aclose())
+        except RuntimeError:
+            # An event loop is still running (or already torn down) — nothing to do
+            pass
+
+atexit.register(_close_clients)
@@ -1,40 +1,84 @@
 """
 Tracks processed emails to avoid reprocessing.
-Uses a simple JSON file to store email IDs that have been processed.
+Uses a SQLite table with a primary-key index: lookups don't need the full
+history in RAM and startup no longer loads every ID. Marks are buffered in
+memory and written+committed in batches (every FLUSH_EVERY, and on exit),
+so a sync run costs a handful of commits instead of one per email — and no
+write transaction is held open between flushes, so other processes can
+open the database while a sync runs.
+Legacy JSON/log tracking files are migrated once and then renamed aside.
 """
+import atexit
 import json
+import sqlite3
 from pathlib import Path
-from typing import Set
+
+FLUSH_EVERY = 50  # Commit after this many marks instead of after every one
 
 class EmailTracker:
-    def __init__(self, tracking_file: str = "data/processed_emails.json"):
-        self.tracking_file = Path(tracking_file)
-        self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
-        self.processed_ids: Set[str] = self._load()
-
-    def _load(self) -> Set[str]:
-        """Load processed email IDs from file."""
-        if self.tracking_file.exists():
-            with open(self.tracking_file, 'r') as f:
-                data = json.load(f)
-                return set(data.get('processed_ids', []))
-        return set()
-
-    def _save(self):
-        """Save processed email IDs to file."""
-        with open(self.tracking_file, 'w') as f:
-            json.dump({'processed_ids': list(self.processed_ids)}, f, indent=2)
+    def __init__(self, db_file: str = "data/tracker.db"):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_file)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS processed(id TEXT PRIMARY KEY)")
+        self.db.commit()
+        self._pending: set = set()
+        atexit.register(self.flush)
+        self._migrate_legacy_files()
+
+    def _migrate_legacy_files(self):
+        """Import IDs from the old JSON/append-log tracking files, then
+        rename them aside so the import runs exactly once."""
+        legacy_ids = []
+        json_file = self.db_file.parent / "processed_emails.json"
+        log_file = self.db_file.parent / "processed_emails.log"
+        if json_file.exists():
+            with open(json_file, 'r') as f:
+                legacy_ids.extend(json.load(f).get('processed_ids', []))
+        if log_file.exists():
+            with open(log_file, 'r') as f:
+                legacy_ids.extend(line.strip() for line in f if line.strip())
+        if legacy_ids:
+            self.db.executemany("INSERT OR IGNORE INTO processed VALUES (?)", [(i,) for i in legacy_ids])
+            self.db.commit()
+        for legacy in (json_file, log_file):
+            if legacy.exists():
+                legacy.rename(legacy.with_name(legacy.name + ".migrated"))
 
     def is_processed(self, email_id: str) -> bool:
-        """Check if email has been processed."""
-        return email_id in self.processed_ids
+        """Check if email has been processed (buffer + indexed lookup)."""
+        if email_id in self._pending:
+            return True
+        return bool(self.db.execute("SELECT 1 FROM processed WHERE id=?", (email_id,)).fetchone())
 
     def mark_processed(self, email_id: str):
-        """Mark email as processed."""
-        self.processed_ids.add(email_id)
-        self._save()
+        """Mark email as processed. Marks are buffered in memory — no write
+        transaction stays open between flushes; call flush() (or use the
+        tracker as a context manager) to persist immediately."""
+        self._pending.add(email_id)
+        if len(self._pending) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Write and commit any buffered marks in one short transaction."""
+        if self._pending:
+            self.db.executemany("INSERT OR IGNORE INTO processed VALUES (?)", [(i,) for i in self._pending])
+            self.db.commit()
+            self._pending.clear()
+
+    def processed_ids(self) -> set:
+        """All processed IDs as a set, in one query — for filtering a batch
+        with O(1) membership checks instead of one lookup per email."""
+        return self._pending | {row[0] for row in self.db.execute("SELECT id FROM processed")}
 
     def get_count(self) -> int:
-        """Get count of processed emails."""
-        return len(self.processed_ids)
-    
\ No newline at end of file
+        """Get count of processed emails (flushes the buffer first)."""
+        self.flush()
+        return self.db.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
@@ -0,0 +1,58 @@
+"""
+Content-addressed cache for embedding vectors.
+Newsletters repeat phrasing heavily ("OpenAI releases...", "Anthropic
+announces..."), so identical headlines show up across issues; caching by
+content hash lets those skip the ONNX encode entirely. Vectors are stored
+as float32 blobs in a SQLite table (same storage choice as the email
+tracker), keyed by a hash of model name + text so a model switch never
+serves stale vectors.
+"""
+import hashlib
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Callable, List
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, db_file: str = "data/embeddings.db"):
+        self.model_name = model_name
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS embeddings(key BLOB PRIMARY KEY, vector BLOB)")
+        self.db.commit()
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode()).digest()
+
+    def get_or_compute_many(self, texts: List[str], embed_fn: Callable[[List[str]], list]) -> list:
+        """
+        Return a vector per text, computing only the cache misses.
+        embed_fn receives the list of miss texts and must return their
+        vectors in order; misses are persisted in one commit.
+        """
+        keys = [self._key(text) for text in texts]
+        vectors: list = [None] * len(texts)
+        for i, key in enumerate(keys):
+            row = self.db.execute("SELECT vector FROM embeddings WHERE key=?", (key,)).fetchone()
+            if row:
+                cached = array('f')
+                cached.frombytes(row[0])
+                vectors[i] = list(cached)
+
+        misses = [i for i, v in enumerate(vectors) if v is None]
+        if misses:
+            computed = embed_fn([texts[i] for i in misses])
+            for i, vector in zip(misses, computed):
+                vector = list(vector)
+                vectors[i] = vector
+                self.db.execute(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    (keys[i], array('f', vector).tobytes())
+                )
+            self.db.commit()
+        return vectors
+
+    def get_or_compute(self, text: str, embed_fn: Callable[[List[str]], list]) -> list:
+        return self.get_or_compute_many([text], embed_fn)[0]
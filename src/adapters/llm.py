@@ -4,13 +4,22 @@ It defines functions that take raw newsletter text as input and return structure
 This abstraction allows the core application logic to remain decoupled from the specifics of how the LLM is called and how responses are parsed.
 """
 
-from openai import OpenAI, APIError
+import httpx
+from openai import AsyncOpenAI, APIError
+from openai.lib._pydantic import to_strict_json_schema
 from dotenv import load_dotenv
 load_dotenv()
-from src.core.entities import NewsletterDigest, NewsletterSource
+from src.core.entities import IntelligenceNode, NewsletterDigest, NewsletterSource
 import os
 import asyncio
-from typing import List
+import hashlib
+import orjson
+import random
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
 
 from utils.logging_setup import get_logger
 logger = get_logger(__name__, log_file="adapters.log")
@@ -23,30 +32,21 @@ MODEL = os.getenv('GITHUB_MODEL_NAME')
 MAX_INPUT_CHARS = int(os.getenv('MAX_INPUT_CHARS', 6000))  # Leave buffer for response
 CHUNK_OVERLAP = 200  # Characters to overlap between chunks for context
 MIN_RELEVANCE_SCORE = int(os.getenv('MIN_RELEVANCE_SCORE', 5))
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 8))  # Max chunk requests in flight at once
+LLM_RPM = int(os.getenv('LLM_RPM', 60))  # Requests-per-minute budget
+LLM_TPM = int(os.getenv('LLM_TPM', 100000))  # Tokens-per-minute budget
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0  # Seconds; doubles per attempt with jitter
+CACHE_FILE = Path(os.getenv('LLM_CACHE_FILE', 'data/llm_cache.jsonl'))
+CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL', 7 * 24 * 3600))  # Drop cached digests after a week
+CHUNK_CACHE_MAX = 512  # In-memory LRU size for chunk-level extractions
+LLM_CHUNK_BATCH = int(os.getenv('LLM_CHUNK_BATCH', 4))  # Chunks per chat-completions request
+MAX_OUTPUT_TOKENS = int(os.getenv('MAX_OUTPUT_TOKENS', 2000))  # Response budget for structured parse
+PARSE_TIMEOUT = int(os.getenv('PARSE_TIMEOUT', 60))  # Hard cap (s) on the final structured parse
+# Escape hatch: re-enable full pydantic validation of LLM output for debugging
+VALIDATE_LLM_OUTPUT = os.getenv('VALIDATE_LLM_OUTPUT', '0') == '1'
 
 # prompt templates
-EXTRACTION_PROMPT = """You are analyzing part {chunk_index} of {total_chunks} from an AI/tech newsletter.
-
-EXTRACT ONLY:
-- Product launches, new features, or major updates (e.g., "GPT-5 released", "Claude now supports vision")
-- Key technical benchmarks or research findings (e.g., "40 percent improvement on MMLU", "New SOTA on ImageNet")
-- Important company announcements (funding, acquisitions, partnerships)
-- Links to official sources, research papers, or product pages
-
-IGNORE AND SKIP:
-- Advertisements, sponsor messages, or promotional content
-- Newsletter subscription prompts ("Subscribe to our premium tier...")
-- Social media follow requests
-- Generic industry commentary without specific news
-- Job postings or event promotions
-- Affiliate links or discount codes
-- "In case you missed it" recaps of old news
-
-Format as concise bullets with full URLs. If nothing newsworthy in this section, return "No significant updates."
-
-Newsletter section:
-{chunk}"""
-
 SUMMARY_PROMPT = """You are a Principal AI Engineer creating a curated digest of important AI/tech updates.
 
 STRICT RULES:
@@ -60,128 +60,344 @@ STRICT RULES:
 If the input contains no real news, return an empty insights list.
 """
 
-client = OpenAI(
-    base_url=ENDPOINT,
-    api_key=TOKEN,
-)
+BATCH_SUMMARY_PROMPT = SUMMARY_PROMPT + """
+The input contains SEVERAL separate newsletters, delimited by lines of the
+form ===EMAIL N===. Return one digest per newsletter in the "digests"
+array, in the same order as the input. A newsletter with no real news
+still gets a digest (with an empty insights list) — never drop or reorder
+entries.
+"""
+
+# Delimiter used to row-marshal several email bodies into one request
+_EMAIL_DELIM = "\n\n===EMAIL {}===\n\n"
+
+# JSON schema for structured output, built once at import time instead of the
+# SDK re-generating it from the pydantic model on every parse call.
+# to_strict_json_schema is the same transform .parse() applies internally:
+# strict mode rejects schemas unless every object sets
+# additionalProperties: false and lists all properties as required, which
+# pydantic's raw model_json_schema() does not.
+_STRICT_DIGEST_SCHEMA = to_strict_json_schema(NewsletterDigest)
+
+_DIGEST_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "NewsletterDigest",
+        "schema": _STRICT_DIGEST_SCHEMA,
+        "strict": True,
+    },
+}
+
+def _batch_digest_schema() -> dict:
+    """Wrapper schema for the batched path: one digest per marshaled email.
+    The digest schema's $defs are hoisted to the wrapper root so its
+    internal "#/$defs/..." refs keep resolving."""
+    item = dict(_STRICT_DIGEST_SCHEMA)
+    defs = item.pop("$defs", None)
+    schema = {
+        "type": "object",
+        "properties": {
+            "digests": {
+                "type": "array",
+                "items": item,
+            }
+        },
+        "required": ["digests"],
+        "additionalProperties": False,
+    }
+    if defs:
+        schema["$defs"] = defs
+    return schema
+
+_BATCH_DIGEST_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "NewsletterDigestBatch",
+        "schema": _batch_digest_schema(),
+        "strict": True,
+    },
+}
+
+# Granular timeouts so a single slow read can't hang a request indefinitely.
+# The shared httpx client keeps one HTTP/2 connection pool for all LLM calls.
+from src.adapters._http import shared_client
+
+_clients: dict = {}
+
+def _client() -> AsyncOpenAI:
+    """One AsyncOpenAI per running event loop: the pooled connections bind
+    to the loop they are opened on, and Streamlit's asyncio.run creates a
+    fresh loop per button click (see _http.shared_client)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        for stale in [l for l in _clients if l.is_closed()]:
+            del _clients[stale]
+        client = _clients[loop] = AsyncOpenAI(
+            base_url=ENDPOINT,
+            api_key=TOKEN,
+            timeout=httpx.Timeout(connect=5, read=30, write=10, pool=5),
+            max_retries=3,
+            http_client=shared_client(),
+        )
+    return client
+
+class AsyncRateLimiter:
+    """
+    Proactive RPM + TPM leaky-bucket limiter for LLM calls.
+    Waiting up front converts time we would spend sleeping after a 429 into useful throughput:
+    total runtime approaches ceil(total_tokens / TPM) * 60s instead of being dominated by retries.
+    """
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_capacity = requests_per_minute
+        self.token_capacity = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """Top up both buckets based on elapsed time."""
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.available_requests = min(self.request_capacity, self.available_requests + elapsed * self.request_capacity / 60)
+        self.available_tokens = min(self.token_capacity, self.available_tokens + elapsed * self.token_capacity / 60)
+        self.last_refill = now
+
+    async def acquire(self, estimated_tokens: int):
+        """Block until one request slot and the estimated token budget are available."""
+        while True:
+            async with self._lock:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= estimated_tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= estimated_tokens
+                    return
+                # Sleep just long enough for the short bucket to refill
+                request_wait = (1 - self.available_requests) * 60 / self.request_capacity
+                token_wait = (estimated_tokens - self.available_tokens) * 60 / self.token_capacity
+            wait = max(request_wait, token_wait, 0.05)
+            logger.debug(f"⏳ Rate limiter: waiting {wait:.2f}s before next LLM call")
+            await asyncio.sleep(wait)
+
+limiter = AsyncRateLimiter(LLM_RPM, LLM_TPM)
+
+def _estimate_tokens(text: str, max_output_tokens: int = 1000) -> int:
+    """Rough token estimate (~4 chars/token) plus the response budget."""
+    return len(text) // 4 + max_output_tokens
+
+async def _call_with_retry(make_request, estimated_tokens: int):
+    """
+    Acquire rate-limit budget, then run the request with exponential backoff
+    on 429/5xx so one throttled chunk doesn't abort the whole extraction.
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        await limiter.acquire(estimated_tokens)
+        try:
+            return await make_request()
+        except APIError as e:
+            status = getattr(e, 'status_code', None)
+            retryable = status == 429 or (status is not None and status >= 500)
+            if retryable and attempt < RETRY_ATTEMPTS - 1:
+                delay = RETRY_BASE_DELAY * 2 ** attempt + random.random()
+                logger.warning(f"⚠️ LLM call failed with status {status}, retrying in {delay:.1f}s (attempt {attempt + 1}/{RETRY_ATTEMPTS})")
+                await asyncio.sleep(delay)
+                continue
+            raise
+
+def _construct_digest(data: dict) -> NewsletterDigest:
+    """
+    Build a NewsletterDigest from schema-conforming data without a second
+    validation pass: strict structured-output mode already enforces the
+    schema server-side, so model_construct skips the field-by-field checks.
+    Set VALIDATE_LLM_OUTPUT=1 to restore full validation when debugging.
+    """
+    if VALIDATE_LLM_OUTPUT:
+        return NewsletterDigest.model_validate(data)
+
+    fields = dict(data)
+    fields["source"] = NewsletterSource.model_construct(**(data.get("source") or {"name": "unknown"}))
+    fields["insights"] = [IntelligenceNode.model_construct(**i) for i in data.get("insights", [])]
+    # Drop any model-supplied timestamp so the default_factory stamps a real datetime
+    fields.pop("processed_at", None)
+    return NewsletterDigest.model_construct(**fields)
+
+def _cache_key(text: str) -> str:
+    """Content hash so identical inputs (retries, repeated boilerplate) hit the cache."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+# Digest cache: in-process dict backed by an append-only JSONL file so cache
+# hits survive restarts. Chunk cache is in-memory only (LRU).
+_digest_cache: dict = {}
+_chunk_cache: OrderedDict = OrderedDict()
+
+def _load_digest_cache():
+    """Load persisted digests, dropping entries older than the TTL."""
+    if not CACHE_FILE.exists():
+        return
+    cutoff = time.time() - CACHE_TTL_SECONDS
+    try:
+        with open(CACHE_FILE, 'rb') as fh:
+            for line in fh:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                if entry.get("ts", 0) >= cutoff:
+                    _digest_cache[entry["key"]] = entry["digest"]
+        logger.debug(f"💾 Loaded {len(_digest_cache)} cached digests from {CACHE_FILE}")
+    except OSError as e:
+        logger.warning(f"⚠️ Could not read LLM cache file: {e}")
+
+def _store_digest(key: str, digest: NewsletterDigest):
+    """Persist a successful extraction to the in-process dict and the JSONL file."""
+    dumped = digest.model_dump(mode="json")
+    _digest_cache[key] = dumped
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, 'ab') as fh:
+            fh.write(orjson.dumps({"key": key, "ts": time.time(), "digest": dumped}))
+            fh.write(b'\n')
+    except OSError as e:
+        logger.warning(f"⚠️ Could not persist digest to LLM cache: {e}")
+
+def _cached_digest(key: str) -> Optional[NewsletterDigest]:
+    """Return a cached NewsletterDigest for this content hash, if any."""
+    cached = _digest_cache.get(key)
+    if cached is None:
+        return None
+    # Cache entries were validated/filtered before being stored
+    return _construct_digest(cached)
+
+_load_digest_cache()
+
+# Boundary positions: paragraph breaks first, sentence ends as fallback
+_BOUND_RE = re.compile(r"\n\n+|(?<=[.!?])\s+")
 
 def _smart_chunk_text(text: str, max_chars: int = MAX_INPUT_CHARS) -> List[str]:
     """
-    Chunk by characters (simple and robust):
-    - Split on paragraph boundaries
-    - Keep overlap between chunks for context
+    Chunk by characters in a single linear scan:
+    - Precompiled boundary regex (paragraph breaks, then sentence ends)
+    - Emits slices of the original text, no intermediate joins or re-summing
+    - Keeps CHUNK_OVERLAP trailing characters between chunks for context
     """
     if len(text) <= max_chars:
         logger.debug("📌 Text fits within char limit, no chunking needed")
         return [text]
 
     chunks: List[str] = []
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-
-    current_chunk: List[str] = []
-    current_len = 0
-
-    for para in paragraphs:
-        para_len = len(para) + 2  # account for separator
-
-        # If single paragraph exceeds limit, split by sentence heuristics
-        if para_len > max_chars:
-            logger.debug("✂️ Paragraph longer than max_chars, splitting by sentences")
-            sentences = [s.strip() for s in para.split('. ') if s.strip()]
-            for sent in sentences:
-                sent_len = len(sent) + 2
-                if current_len + sent_len > max_chars and current_chunk:
-                    chunks.append('\n\n'.join(current_chunk))
-                    # keep small overlap
-                    current_chunk = current_chunk[-1:] if current_chunk else []
-                    current_len = sum(len(p) + 2 for p in current_chunk)
-                current_chunk.append(sent)
-                current_len += sent_len
-        else:
-            if current_len + para_len > max_chars and current_chunk:
-                logger.debug("📦 Current chunk full (chars: %d), starting new chunk", current_len)
-                chunks.append('\n\n'.join(current_chunk))
-                # keep last paragraph as overlap
-                current_chunk = [current_chunk[-1], para] if current_chunk else [para]
-                current_len = sum(len(p) + 2 for p in current_chunk)
-            else:
-                current_chunk.append(para)
-                current_len += para_len
+    start = 0       # Offset where the current chunk begins
+    seg_start = 0   # Offset where the segment being scanned begins
+
+    for m in _BOUND_RE.finditer(text):
+        if m.end() - start < max_chars:
+            seg_start = m.end()
+            continue
+        if seg_start > start:
+            # Cut before the segment that would overflow; the next chunk
+            # starts CHUNK_OVERLAP characters back for context.
+            chunks.append(text[start:seg_start].rstrip())
+            start = max(seg_start - CHUNK_OVERLAP, start + 1)
+        # A boundary-free segment longer than max_chars — whether or not a
+        # cut just happened — still overflows: hard-slice until it fits
+        if m.end() - start >= max_chars:
+            logger.debug("✂️ Segment longer than max_chars, hard-slicing")
+            while m.end() - start >= max_chars:
+                chunks.append(text[start:start + max_chars])
+                start += max_chars - CHUNK_OVERLAP
+        seg_start = m.end()
 
-    if current_chunk:
-        chunks.append('\n\n'.join(current_chunk))
+    # Flush the tail, hard-slicing if there were no boundaries near the end
+    while len(text) - start >= max_chars:
+        chunks.append(text[start:start + max_chars])
+        start += max_chars - CHUNK_OVERLAP
+    tail = text[start:].strip()
+    if tail:
+        chunks.append(tail)
 
     logger.debug("❗️ Split text into %d chunks (chars: %d)", len(chunks), len(text))
     return chunks
 
-def _extract_from_chunk_sync(chunk: str, chunk_index: int, total_chunks: int) -> str:
+# Single compiled alternation: one C-level scan over the headline instead of
+# a Python-level substring search per keyword.
+_SPAM_RE = re.compile(
+    r"sponsor|advertisement|subscribe|discount|affiliate|partner content|"
+    r"promoted|job opening|unsubscribe|follow us|join our",
+    re.IGNORECASE
+)
+
+async def _extract_group_insights(chunk_group: List[str], start_index: int, total_chunks: int) -> List[IntelligenceNode]:
     """
-    Extract key insights from a single chunk.
-    Returns plain text summary rather than structured format for intermediate steps.
-    
-    ENHANCEMENT: More aggressive filtering of ads, sponsors, and fluff
+    Extract structured insights for a group of chunks in ONE LLM call.
+    Going straight to structured output removes the old extract-then-reparse
+    double pass: a newsletter now costs ceil(chunks / LLM_CHUNK_BATCH)
+    requests instead of chunks + 1.
     """
+    # Serve repeated groups (boilerplate across issues) straight from the LRU cache
+    key = f"{_cache_key(chr(10).join(chunk_group))}:{MODEL}"
+    if key in _chunk_cache:
+        _chunk_cache.move_to_end(key)
+        logger.debug(f"💾 Chunk group at {start_index + 1} served from cache")
+        return [IntelligenceNode.model_construct(**d) for d in _chunk_cache[key]]
+
+    combined = "\n\n---\n\n".join(chunk_group)
     try:
-        # ENHANCED PROMPT: More specific instructions to filter noise
-        prompt = EXTRACTION_PROMPT.format(
-            chunk_index=chunk_index+1,
-            total_chunks=total_chunks,
-            chunk=chunk
-        )
-        
-        response = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": "You are a Principal AI Engineer who filters signal from noise in tech newsletters. You are extremely selective and only extract genuinely important updates."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,  # LOW: We want consistent, factual extraction
-            max_tokens=1000
-        )
-        
-        result = response.choices[0].message.content.strip()
-        logger.info(f"✅ Successfully extracted insights from chunk {chunk_index + 1}/{total_chunks}")
-        
-        # ENHANCEMENT: Skip chunks with no real content
-        if "No significant updates" in result or len(result) < 50:
-            logger.debug(f"Chunk {chunk_index} contained no significant updates, skipping")
-            return "[No updates]"
-        
-        return result
-        
+        digest = await asyncio.wait_for(_parse_combined_summary(combined), timeout=PARSE_TIMEOUT)
     except APIError as e:
-        logger.error(f"LLM API error on chunk {chunk_index}: {e}")
-        return f"[Error processing chunk {chunk_index}]"
+        logger.error(f"LLM API error on chunk group starting at {start_index}: {e}")
+        return []
+
+    insights = digest.insights if digest is not None else []
+    logger.info(f"✅ Extracted {len(insights)} insights from chunks {start_index + 1}-{start_index + len(chunk_group)}/{total_chunks}")
+
+    _chunk_cache[key] = [i.model_dump(mode="json") for i in insights]
+    if len(_chunk_cache) > CHUNK_CACHE_MAX:
+        _chunk_cache.popitem(last=False)
 
-def _parse_combined_summary_sync(combined_text: str):
+    return insights
+
+async def _parse_combined_summary(combined_text: str):
     """
     Parse the combined summary into structured NewsletterDigest.
     This is the final structured extraction step.
-    
+    Uses the pre-built _DIGEST_SCHEMA and validates the JSON ourselves, so
+    the schema isn't regenerated inside the SDK on every call.
+
     ENHANCEMENT: More aggressive filtering instructions
     """
     try:
-        return client.chat.completions.parse(
-            model=MODEL,
-            response_format=NewsletterDigest,
-            messages=[
-                {"role": "system", "content": SUMMARY_PROMPT},
-                {"role": "user", "content": combined_text}
-            ],
-            temperature=0.1  # VERY LOW: We want consistent, strict filtering
+        response = await _call_with_retry(
+            lambda: _client().chat.completions.create(
+                model=MODEL,
+                response_format=_DIGEST_SCHEMA,
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": combined_text}
+                ],
+                temperature=0.1,  # VERY LOW: We want consistent, strict filtering
+                max_tokens=MAX_OUTPUT_TOKENS
+            ),
+            estimated_tokens=_estimate_tokens(combined_text, MAX_OUTPUT_TOKENS)
         )
     except APIError as e:
         logger.error(f"Failed to parse combined summary: {e}")
         raise
 
+    content = response.choices[0].message.content
+    if not content:
+        logger.warning("⚠️ LLM returned empty content for structured parse")
+        return None
+
+    return _construct_digest(orjson.loads(content))
+
 async def extract_digest_from_text(raw_text: str) -> NewsletterDigest:
     """
-    Robust multi-stage extraction:
+    Robust extraction:
     1. Chunk if needed (by character count)
-    2. Extract insights from each chunk in parallel (with aggressive filtering)
-    3. Combine and parse into structured format
+    2. One structured extraction per chunk group, in parallel
+    3. Merge the insights lists in Python
     4. ENHANCEMENT: Filter out low-relevance insights after parsing
-    
+
     Falls back gracefully if any stage fails.
     """
     logger.info("⚙️ Starting digest extraction...")
@@ -193,14 +409,23 @@ async def extract_digest_from_text(raw_text: str) -> NewsletterDigest:
         raise ValueError("Cannot extract digest from empty text")
     
     logger.debug(f"Input length: {len(text)} chars")
-    
+
+    # Cache check: identical content (retries, duplicate sends) skips the LLM entirely
+    cache_key = _cache_key(text)
+    cached = _cached_digest(cache_key)
+    if cached is not None:
+        logger.info("💾 Digest cache hit - skipping LLM extraction")
+        return cached
+
     # Strategy 1: Direct parse for small inputs
     if len(text) <= MAX_INPUT_CHARS:
         logger.info("Input fits in single request - using direct parse")
         try:
-            digest = await asyncio.to_thread(_parse_combined_summary_sync, text)
+            digest = await asyncio.wait_for(_parse_combined_summary(text), timeout=PARSE_TIMEOUT)
 
-            return _filter_digest(digest)
+            filtered = _filter_digest(digest)
+            _store_digest(cache_key, filtered)
+            return filtered
         except APIError as e:
             if '413' in str(e) or 'too large' in str(e).lower():
                 logger.warning("Direct parse failed with 413, falling back to chunking")
@@ -208,46 +433,137 @@ async def extract_digest_from_text(raw_text: str) -> NewsletterDigest:
                 raise
         logger.info("⬇️ Falling through to chunked extraction...")
     
-    # Strategy 2: Chunk, extract, combine, parse
-    logger.info("Using multi-stage chunked extraction")
+    # Strategy 2: Chunk, then ONE structured extraction per chunk group
+    logger.info("Using chunked structured extraction")
     chunks = _smart_chunk_text(text, max_chars=MAX_INPUT_CHARS)
-    
-    # Extract insights from chunks in parallel (with concurrency limit)
-    summaries = []
-    semaphore = asyncio.Semaphore(1)  # Conservative: 1 request at a time to avoid rate limits
-    
-    async def _process_chunk(chunk: str, idx: int) -> str:
+
+    # Each group of LLM_CHUNK_BATCH chunks shares one request.
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)  # Bound in-flight requests to avoid rate limits
+
+    async def _process_group(group: List[str], start: int) -> List[IntelligenceNode]:
         async with semaphore:
-            return await asyncio.to_thread(_extract_from_chunk_sync, chunk, idx, len(chunks))
-    
-    tasks = [_process_chunk(chunk, i) for i, chunk in enumerate(chunks)]
-    summaries = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Filter out errors, empty chunks, and combine
-    valid_summaries = [
-        s for s in summaries 
-        if isinstance(s, str) 
-        and not s.startswith('[Error')
-        and not s.startswith('[No updates')
+            return await _extract_group_insights(group, start, len(chunks))
+
+    tasks = [
+        _process_group(chunks[i:i + LLM_CHUNK_BATCH], i)
+        for i in range(0, len(chunks), LLM_CHUNK_BATCH)
     ]
-    
-    if not valid_summaries:
-        logger.warning("No valid content found after filtering chunks")
+    group_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    insights: List[IntelligenceNode] = []
+    for r in group_results:
+        if isinstance(r, Exception):
+            logger.error(f"Chunk group extraction failed: {r}")
+            continue
+        insights.extend(r)
+
+    if not insights:
+        logger.warning("No insights extracted from any chunk group")
         # Return empty digest rather than crashing
         return NewsletterDigest(
             source=NewsletterSource(name="unknown"),
             insights=[]
         )
-    
-    combined = "\n\n---\n\n".join(valid_summaries)
-    logger.info(f"📒 Combined {len(valid_summaries)}/{len(chunks)} chunk summaries (combined chars: {len(combined)})")
-    
-    # Final structured parse
-    logger.info("Parsing combined summary into structured format")
-    digest = await asyncio.to_thread(_parse_combined_summary_sync, combined)
-    
+
+    logger.info(f"📒 Merged {len(insights)} insights from {len(tasks)} group requests ({len(chunks)} chunks)")
+
+    digest = NewsletterDigest(
+        source=NewsletterSource(name="unknown"),
+        insights=insights
+    )
+
     # ENHANCEMENT: Post-processing filter
-    return _filter_digest(digest)
+    filtered = _filter_digest(digest)
+    _store_digest(cache_key, filtered)
+    return filtered
+
+async def extract_digests_batch(bodies: List[str]) -> List[NewsletterDigest]:
+    """
+    Extract digests for several email bodies with ONE row-marshaled LLM
+    call: the bodies are concatenated with ===EMAIL N=== delimiters and the
+    model returns a "digests" array, amortizing network and prefill
+    overhead across the burst. Cached bodies are served without touching
+    the request; oversized batches fall back to the single-email path,
+    which already chunks.
+    """
+    if not bodies:
+        return []
+
+    results: List[Optional[NewsletterDigest]] = [None] * len(bodies)
+    pending: List[tuple] = []  # (position, cache key, stripped text)
+
+    for idx, body in enumerate(bodies):
+        text = body.strip()
+        if not text:
+            results[idx] = NewsletterDigest(source=NewsletterSource(name="unknown"), insights=[])
+            continue
+        key = _cache_key(text)
+        cached = _cached_digest(key)
+        if cached is not None:
+            logger.info("💾 Digest cache hit for batch member - skipping LLM")
+            results[idx] = cached
+        else:
+            pending.append((idx, key, text))
+
+    async def _fallback_singles():
+        """Per-email extraction for whatever couldn't go through the batch call."""
+        singles = await asyncio.gather(
+            *(extract_digest_from_text(text) for _, _, text in pending),
+            return_exceptions=True
+        )
+        for (idx, _, _), digest in zip(pending, singles):
+            if isinstance(digest, Exception):
+                logger.error(f"Batch member {idx} failed: {digest}")
+                results[idx] = NewsletterDigest(source=NewsletterSource(name="unknown"), insights=[])
+            else:
+                results[idx] = digest
+
+    if not pending:
+        return results
+
+    if len(pending) == 1 or sum(len(text) for _, _, text in pending) > MAX_INPUT_CHARS:
+        # A lone or oversized batch gains nothing from row-marshaling
+        await _fallback_singles()
+        return results
+
+    marked = "".join(
+        _EMAIL_DELIM.format(i + 1) + text for i, (_, _, text) in enumerate(pending)
+    )
+    digests: List[NewsletterDigest] = []
+    try:
+        response = await _call_with_retry(
+            lambda: _client().chat.completions.create(
+                model=MODEL,
+                response_format=_BATCH_DIGEST_SCHEMA,
+                messages=[
+                    {"role": "system", "content": BATCH_SUMMARY_PROMPT},
+                    {"role": "user", "content": marked}
+                ],
+                temperature=0.1,
+                max_tokens=MAX_OUTPUT_TOKENS * len(pending)
+            ),
+            estimated_tokens=_estimate_tokens(marked, MAX_OUTPUT_TOKENS * len(pending))
+        )
+        content = response.choices[0].message.content
+        if content:
+            digests = [_construct_digest(d) for d in orjson.loads(content)["digests"]]
+    except (APIError, orjson.JSONDecodeError, KeyError, ValueError) as e:
+        logger.error(f"Batched extraction failed, falling back to per-email calls: {e}")
+
+    if len(digests) != len(pending):
+        if digests:
+            logger.warning(
+                f"⚠️ Batched extraction returned {len(digests)} digests for {len(pending)} emails, retrying individually"
+            )
+        await _fallback_singles()
+        return results
+
+    for (idx, key, _), digest in zip(pending, digests):
+        filtered = _filter_digest(digest)
+        _store_digest(key, filtered)
+        results[idx] = filtered
+
+    return results
 
 def _filter_digest(digest):
     """
@@ -277,21 +593,15 @@ def _filter_digest(digest):
     
     # Filter by relevance score and quality signals
     filtered_insights = []
-    spam_keywords = [
-        'sponsor', 'advertisement', 'subscribe', 'discount', 
-        'affiliate', 'partner content', 'promoted', 'job opening',
-        'unsubscribe', 'follow us', 'join our'
-    ]
-    
+
     for insight in parsed.insights:
         # Check 1: Relevance score
         if insight.relevance_score < MIN_RELEVANCE_SCORE:
             logger.debug(f"🚮 Filtered low relevance ({insight.relevance_score}): {insight.headline}")
             continue
-        
-        # Check 2: Spam keywords in headline
-        headline_lower = insight.headline.lower()
-        if any(keyword in headline_lower for keyword in spam_keywords):
+
+        # Check 2: Spam keywords in headline (one compiled-regex pass)
+        if _SPAM_RE.search(insight.headline):
             logger.debug(f"🚮 Filtered spam keyword: {insight.headline}")
             continue
         
@@ -1,4 +1,5 @@
 from nylas import Client
+import asyncio
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -22,18 +23,24 @@ class NylasAdapter:
         self.grant_id = NYLAS_GRANT_ID
         self.search_query = SEARCH_QUERY
 
-    async def get_latest_newsletters(self, limit: int = LIMIT):
-        """Fetches the most recent newsletters based on sender filters."""
+    async def iter_latest_newsletters(self, limit: int = LIMIT):
+        """
+        Yields newsletters one at a time.
+        The Nylas SDK call is synchronous, so it runs in a worker thread via
+        asyncio.to_thread instead of blocking the event loop; callers can stop
+        iterating early (e.g. once the tracker filters the remainder).
+        """
         # You can filter by 'from' to only get newsletters
         # e.g., 'dan@tldr.tech', 'pete@theneuron.ai'
-        raw = self.nylas.messages.list(
+        raw = await asyncio.to_thread(
+            self.nylas.messages.list,
             self.grant_id,
             query_params={
                 "limit": limit,
                 "search_query_native": self.search_query
             }
         )
-        
+
         if isinstance(raw, (tuple, list)):
             if len(raw) >= 1:
                 messages = raw[0]
@@ -45,15 +52,19 @@ class NylasAdapter:
         # Ensure messages is iterable/list
         messages = list(messages) if not isinstance(messages, list) else messages
 
-        newsletter_data = []
         for msg in messages:
-            newsletter_data.append({
+            yield {
                 "id": msg.id,
                 "from": msg.from_[0]['email'],
                 "subject": msg.subject,
                 "body": msg.body, # Nylas gives you the full HTML/Text
                 "date": msg.date
-            })
+            }
+
+    async def get_latest_newsletters(self, limit: int = LIMIT):
+        """Fetches the most recent newsletters based on sender filters."""
+        newsletter_data = [nl async for nl in self.iter_latest_newsletters(limit)]
+
         logger.info(f"🔎 Fetched {len(newsletter_data)} newsletters from Nylas.")
         logger.debug(f"📬 Newsletter subjects: {[n['subject'] for n in newsletter_data]}")
 
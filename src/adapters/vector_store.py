@@ -7,9 +7,15 @@ This abstraction allows the core application logic to remain decoupled from the
 - Fastembed: It keeps your costs at 0 for the PoC while maintaining high accuracy for short text snippets like headlines.
 """
 
-from qdrant_client import QdrantClient, models
+from qdrant_client import QdrantClient, AsyncQdrantClient, models
 from fastembed import TextEmbedding
-from typing import Optional
+from src.adapters.embedding_cache import EmbeddingCache
+from typing import List, Optional, Tuple
+import copy
+import functools
+import hashlib
+import threading
+import time
 import uuid
 from dotenv import load_dotenv
 load_dotenv()
@@ -19,14 +25,56 @@ from utils.logging_setup import get_logger
 logger = get_logger(__name__, log_file="adapters.log")
 
 THRESHOLD = float(os.getenv("THRESHOLD", 0.85))
+# The Qdrant-hosted ONNX export of bge-small is int8-quantized, so inference
+# runs on SIMD int8 kernels instead of FP32 matmuls.
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+PAYLOAD_CACHE_TTL = int(os.getenv("PAYLOAD_CACHE_TTL", 3600))  # Seconds before a cached payload is re-fetched
+VECTOR_CACHE_MAX = 1024  # Safety bound on vectors stashed between dedup and upsert
+
+@functools.lru_cache(maxsize=1)
+def _get_encoder() -> TextEmbedding:
+    """
+    Lazy singleton for the embedding model: the BGE ONNX load (download +
+    session init) happens once per process, and only when embeddings are
+    actually needed — constructing a VectorService stays cheap.
+    """
+    return TextEmbedding(model_name=EMBEDDING_MODEL, providers=["CPUExecutionProvider"])
+
+# Pre-warm on a daemon thread so the first embedding call usually finds the
+# model already loaded instead of paying the load itself.
+threading.Thread(target=_get_encoder, daemon=True).start()
 
 class VectorService:
     def __init__(self, collection_name: str = "nutshell"):
-        self.client = QdrantClient(host="localhost", port=6333)
-        self.encoder = TextEmbedding() # Defaults to BAAI/bge-small-en-v1.5
+        # Sync client for collection setup and read-only consumers (Streamlit, API);
+        # async client for the ingestion path so round-trips overlap on the event loop.
+        # Both prefer gRPC: lower per-call overhead than HTTP+JSON, which adds
+        # up across the dedup/upsert round-trips per email.
+        self.client = QdrantClient(host="localhost", port=6333, grpc_port=6334, prefer_grpc=True, timeout=30)
+        self.aclient = AsyncQdrantClient(host="localhost", port=6333, grpc_port=6334, prefer_grpc=True, timeout=30)
         self.collection_name = collection_name
+        # Write-through payload cache (point_id -> (expires_at, payload)) so
+        # repeated merges against the same point skip the Qdrant round-trip.
+        self._payload_cache: dict = {}
+        # Embeddings computed during duplicate checks, reused by the upsert
+        # path so each headline is encoded exactly once (content_hash -> vector).
+        self._vector_cache: dict = {}
+        # Persistent content-addressed vector store: repeated headlines
+        # across runs skip the ONNX encode entirely.
+        self._embedding_cache = EmbeddingCache(model_name=EMBEDDING_MODEL)
         self._ensure_collection()
 
+    @property
+    def encoder(self) -> TextEmbedding:
+        """Shared lazily-loaded embedding model."""
+        return _get_encoder()
+
+    def _embed(self, texts: List[str]) -> list:
+        """Embed through the content-addressed cache; only misses hit ONNX."""
+        return self._embedding_cache.get_or_compute_many(
+            texts, lambda misses: list(self.encoder.embed(misses))
+        )
+
     def _ensure_collection(self):
         """Initialize the collection if it doesn't exist."""
         if not self.client.collection_exists(self.collection_name):
@@ -34,39 +82,195 @@ class VectorService:
                 collection_name=self.collection_name,
                 vectors_config=models.VectorParams(
                     size=384, # Size for bge-small-en
-                    distance=models.Distance.COSINE
+                    distance=models.Distance.COSINE,
+                    on_disk=True # Original FP32 vectors stay on disk; search uses the int8 copy
+                ),
+                # Scalar int8 quantization: ~4x less vector RAM and faster HNSW
+                # distance computation via SIMD int8 dot products.
+                quantization_config=models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8,
+                        always_ram=True
+                    )
                 )
             )
+        # Payload indexes for every field the app filters or orders by —
+        # without them a filtered scroll falls back to a full payload scan.
+        # content_hash backs the exact-duplicate fast path specifically.
+        index_schemas = {
+            "content_hash": models.PayloadSchemaType.KEYWORD,
+            "category": models.PayloadSchemaType.KEYWORD,
+            "tags": models.PayloadSchemaType.KEYWORD,
+            "companies_mentioned": models.PayloadSchemaType.KEYWORD,
+            "relevance_score": models.PayloadSchemaType.INTEGER,
+            "mention_count": models.PayloadSchemaType.INTEGER,
+            "first_seen": models.PayloadSchemaType.DATETIME,
+        }
+        for field_name, field_schema in index_schemas.items():
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+            except Exception:
+                # Index already exists
+                pass
+
+    @staticmethod
+    def _content_hash(text: str) -> str:
+        """Normalized hash used for the exact-duplicate fast path."""
+        return hashlib.sha256(text.strip().lower().encode()).hexdigest()
 
-    def find_duplicate(self, text: str, threshold: float = THRESHOLD) -> Optional[str]:
+    def _stash_vector(self, content_hash: str, vector):
+        """Keep a dedup-computed vector for the upsert path. Entries whose
+        upsert never comes (failed ingests) are evicted oldest-first once
+        the bound is hit, so the stash can't grow without limit."""
+        if len(self._vector_cache) >= VECTOR_CACHE_MAX:
+            self._vector_cache.pop(next(iter(self._vector_cache)))
+        self._vector_cache[content_hash] = vector
+
+    async def find_duplicate(self, text: str, threshold: float = THRESHOLD) -> Optional[str]:
         """Returns the ID of a similar news item if it exists above the threshold."""
-        vector = list(self.encoder.embed([text]))[0]
-        
-        results = self.client.query_points(
+        # Fast path: exact headline match via the content_hash payload index —
+        # skips both the FastEmbed encode and the HNSW query.
+        hits, _ = await self.aclient.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=models.Filter(must=[
+                models.FieldCondition(
+                    key="content_hash",
+                    match=models.MatchValue(value=self._content_hash(text))
+                )
+            ]),
+            limit=1,
+            with_payload=False,
+        )
+        if hits:
+            logger.debug(f"find_duplicate: exact content-hash hit for '{text[:20]}...'")
+            return hits[0].id
+
+        vector = self._embed([text])[0]
+        self._stash_vector(self._content_hash(text), vector)
+
+        results = (await self.aclient.query_points(
             collection_name=self.collection_name,
             query=vector,
             limit=1,
-        ).points
+        )).points
+
+        logger.debug("find_duplicate: Queried for text '%.20s...' and got results: %s", text, results)
 
-        logger.debug(f"find_duplicate: Queried for text '{text[:20]}...' and got results: {results}")
-        
         if results and results[0].score >= threshold:
+            # Similarity duplicates take the patch path and never upsert,
+            # so the stashed vector would otherwise linger forever
+            self._vector_cache.pop(self._content_hash(text), None)
             return results[0].id
         return None
 
-    def upsert_insight(self, insight_data: dict, text_for_vector: str):
+    async def find_duplicates_batch(self, texts: List[str], threshold: float = THRESHOLD) -> List[Optional[str]]:
+        """
+        Batch duplicate check: one scroll resolves all exact content-hash
+        matches, then the remaining texts share one embedding call and one
+        query_batch_points request. An email's worth of headlines costs
+        ~3 round-trips instead of 2 per headline.
+        """
+        if not texts:
+            return []
+
+        hashes = [self._content_hash(text) for text in texts]
+
+        # One indexed scroll answers every exact-match lookup at once
+        hash_to_id = {}
+        hits, _ = await self.aclient.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=models.Filter(must=[
+                models.FieldCondition(
+                    key="content_hash",
+                    match=models.MatchAny(any=hashes)
+                )
+            ]),
+            limit=len(texts),
+            with_payload=["content_hash"],
+        )
+        for hit in hits:
+            hash_to_id[hit.payload["content_hash"]] = hit.id
+
+        results: List[Optional[str]] = [hash_to_id.get(h) for h in hashes]
+
+        misses = [(i, texts[i], hashes[i]) for i, found in enumerate(results) if found is None]
+        if not misses:
+            return results
+
+        # One embed batch for every miss, vectors kept for the upsert path
+        vectors = self._embed([text for _, text, _ in misses])
+        for (_, _, h), vector in zip(misses, vectors):
+            self._stash_vector(h, vector)
+
+        # One batched similarity query for all misses
+        responses = await self.aclient.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                models.QueryRequest(query=vector, limit=1)
+                for vector in vectors
+            ],
+        )
+        for (i, _, h), response in zip(misses, responses):
+            points = response.points
+            if points and points[0].score >= threshold:
+                results[i] = points[0].id
+                # Duplicates are patched, never upserted — drop the stash
+                self._vector_cache.pop(h, None)
+
+        return results
+
+    async def get_payloads_batch(self, point_ids: List[str]) -> dict:
+        """
+        Fetch payloads for several points in one retrieve call, honoring the
+        write-through cache. Returns {point_id: payload}.
+        """
+        payloads = {}
+        to_fetch = []
+        now = time.monotonic()
+        for point_id in point_ids:
+            cached = self._payload_cache.get(point_id)
+            if cached and cached[0] > now:
+                # Deep copy: callers mutate nested fields (sources) in place,
+                # and an aliased dict would rewrite the cache before any
+                # write is actually submitted to Qdrant
+                payloads[point_id] = copy.deepcopy(cached[1])
+            else:
+                to_fetch.append(point_id)
+
+        if to_fetch:
+            records = await self.aclient.retrieve(
+                collection_name=self.collection_name,
+                ids=to_fetch
+            )
+            expires_at = time.monotonic() + PAYLOAD_CACHE_TTL
+            for record in records:
+                self._payload_cache[record.id] = (expires_at, record.payload)
+                payloads[record.id] = copy.deepcopy(record.payload)
+
+        logger.debug(f"get_payloads_batch: {len(payloads)} payloads ({len(to_fetch)} fetched)")
+        return payloads
+
+    async def upsert_insight(self, insight_data: dict, text_for_vector: str):
         """
         The 'Write' path: Creates a brand new point with a vector.
+        Reuses the embedding from a preceding find_duplicate call if available.
         """
-        vector = list(self.encoder.embed([text_for_vector]))[0]
-        
+        vector = self._vector_cache.pop(self._content_hash(text_for_vector), None)
+        if vector is None:
+            vector = self._embed([text_for_vector])[0]
+
         # Ensure list fields are initialized if not present
         insight_data.setdefault("tags", [])
         insight_data.setdefault("companies_mentioned", [])
         insight_data.setdefault("key_people", [])
         insight_data.setdefault("links", [])
-        
-        self.client.upsert(
+        insight_data.setdefault("content_hash", self._content_hash(text_for_vector))
+
+        await self.aclient.upsert(
             collection_name=self.collection_name,
             points=[
                 models.PointStruct(
@@ -77,32 +281,135 @@ class VectorService:
             ]
         )
 
-        logger.debug(f"upsert_insight: Upserted insight with headline '{text_for_vector}' and data: {insight_data}")
+        logger.debug("upsert_insight: Upserted insight with headline '%s' and data: %s", text_for_vector, insight_data)
 
-    def get_payload(self, point_id: str) -> dict:
+    async def upsert_insights_batch(self, items: List[Tuple[dict, str]]):
+        """
+        Batch 'Write' path: embeds every text in ONE FastEmbed call (one ONNX
+        batch instead of N dispatches) and writes all points in ONE upsert.
+        Each item is a (insight_data, text_for_vector) tuple.
+        Embeddings already computed by find_duplicate are reused, so only
+        texts the duplicate check never saw are encoded here.
+        """
+        if not items:
+            return
+
+        await self.aclient.upsert(
+            collection_name=self.collection_name,
+            points=self._build_points(items)
+        )
+
+        logger.debug("upsert_insights_batch: Upserted %d insights in one call", len(items))
+
+    def _build_points(self, items: List[Tuple[dict, str]]) -> List[models.PointStruct]:
+        """Embed (reusing duplicate-check vectors) and build PointStructs."""
+        hashes = [self._content_hash(text) for _, text in items]
+        to_embed = [text for (_, text), h in zip(items, hashes) if h not in self._vector_cache]
+        fresh = iter(self._embed(to_embed)) if to_embed else iter(())
+        vectors = [
+            self._vector_cache.pop(h) if h in self._vector_cache else next(fresh)
+            for h in hashes
+        ]
+
+        points = []
+        for (insight_data, text_for_vector), vector in zip(items, vectors):
+            # Ensure list fields are initialized if not present
+            insight_data.setdefault("tags", [])
+            insight_data.setdefault("companies_mentioned", [])
+            insight_data.setdefault("key_people", [])
+            insight_data.setdefault("links", [])
+            insight_data.setdefault("content_hash", self._content_hash(text_for_vector))
+            points.append(
+                models.PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector=vector,
+                    payload=insight_data
+                )
+            )
+        return points
+
+    async def apply_updates_batch(self, patches: List[Tuple[str, dict]], new_items: List[Tuple[dict, str]]):
+        """
+        Submit all of an email's writes — payload patches for merged
+        duplicates plus upserts for new insights — in ONE
+        batch_update_points call, so write count per email is constant
+        instead of one round-trip per insight.
+        """
+        operations: List = []
+        if new_items:
+            operations.append(models.UpsertOperation(
+                upsert=models.PointsList(points=self._build_points(new_items))
+            ))
+        for point_id, new_data in patches:
+            operations.append(models.SetPayloadOperation(
+                set_payload=models.SetPayload(payload=new_data, points=[point_id])
+            ))
+
+        if not operations:
+            return
+
+        await self.aclient.batch_update_points(
+            collection_name=self.collection_name,
+            update_operations=operations,
+            wait=False
+        )
+
+        # Keep the write-through payload cache coherent with the patches
+        for point_id, new_data in patches:
+            cached = self._payload_cache.get(point_id)
+            if cached and cached[0] > time.monotonic():
+                self._payload_cache[point_id] = (time.monotonic() + PAYLOAD_CACHE_TTL, {**cached[1], **new_data})
+            else:
+                self._payload_cache.pop(point_id, None)
+
+        logger.debug("apply_updates_batch: %d patches + %d upserts in one call", len(patches), len(new_items))
+
+    async def get_payload(self, point_id: str) -> dict:
         """
         Retrieves the metadata for an existing point.
         Used to see what sources/links we already have.
+        Served from the write-through cache when fresh.
         """
-        result = self.client.retrieve(
+        cached = self._payload_cache.get(point_id)
+        if cached and cached[0] > time.monotonic():
+            logger.debug(f"get_payload: cache hit for point_id '{point_id}'")
+            # Deep copy so in-place merges by callers can't alias the cache
+            return copy.deepcopy(cached[1])
+
+        result = await self.aclient.retrieve(
             collection_name=self.collection_name,
             ids=[point_id]
         )
 
-        logger.debug(f"get_payload: Retrieved payload for point_id '{point_id}': {result}")
+        logger.debug("get_payload: Retrieved payload for point_id '%s': %s", point_id, result)
 
-        return result[0].payload if result else {}
+        payload = result[0].payload if result else {}
+        self._payload_cache[point_id] = (time.monotonic() + PAYLOAD_CACHE_TTL, payload)
+        return copy.deepcopy(payload)
     
-    def patch_payload(self, point_id: str, new_data: dict):
+    async def patch_payload(self, point_id: str, new_data: dict):
         """
         The 'Update' path: Only modifies specific keys in the metadata.
         Crucial for the 'Merging' logic.
         Handles merging of list fields like tags, companies, and key_people.
         """
-        self.client.set_payload(
+        # wait=False: the call returns once Qdrant has queued the update
+        # instead of blocking on the full apply; readers go through the
+        # write-through cache below anyway.
+        await self.aclient.set_payload(
             collection_name=self.collection_name,
             payload=new_data,
-            points=[point_id]
+            points=[point_id],
+            wait=False
         )
-        logger.debug(f"💬 patch_payload: Patched payload for point_id '{point_id}' with merged data: {new_data}")
+
+        # Keep the cache write-through: fold the patch into the cached copy
+        # rather than invalidating and re-fetching.
+        cached = self._payload_cache.get(point_id)
+        if cached and cached[0] > time.monotonic():
+            self._payload_cache[point_id] = (time.monotonic() + PAYLOAD_CACHE_TTL, {**cached[1], **new_data})
+        else:
+            self._payload_cache.pop(point_id, None)
+
+        logger.debug("💬 patch_payload: Patched payload for point_id '%s' with merged data: %s", point_id, new_data)
         
\ No newline at end of file
@@ -3,16 +3,75 @@ This is the main FastAPI application file that defines the API endpoints for Nut
 Its currently unused because we are processing emails directly in the sync_inbox.py script, but it serves as a placeholder for future API endpoints.
 """
 
-from fastapi import FastAPI, Request, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
-from src.core.use_cases import process_new_email
-from src.adapters.vector_store import VectorService
-from typing import Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from fastapi import FastAPI, Request, Query
+from fastapi.responses import JSONResponse, ORJSONResponse
+import orjson
+from typing import List, Optional
+import asyncio
+import os
 
 from utils.logging_setup import get_logger
 logger = get_logger(__name__, log_file="api_v1.log")
 
-app = FastAPI(title="Nutshell.io API", version="1.0.0")
+# Bounded queue so a burst of webhooks applies backpressure instead of
+# growing memory without limit.
+QUEUE_MAXSIZE = int(os.getenv("WEBHOOK_QUEUE_MAXSIZE", 256))
+# Burst handling: the consumer drains up to BATCH_MAX payloads (waiting at
+# most BATCH_WINDOW seconds for stragglers) and processes them together.
+BATCH_MAX = int(os.getenv("WEBHOOK_BATCH_MAX", 16))
+BATCH_WINDOW = float(os.getenv("WEBHOOK_BATCH_WINDOW", 0.5))
+
+@lru_cache(maxsize=1)
+def get_vector_service():
+    """Process-wide VectorService so handlers don't reconnect per request.
+    Imported lazily: server boot (and every --reload cycle) skips the
+    embedding/Qdrant stack until an insights query actually needs it."""
+    from src.adapters.vector_store import VectorService
+    return VectorService()
+
+async def _email_consumer(queue: asyncio.Queue):
+    """Drains the webhook queue in batches: a burst of newsletters is
+    processed concurrently in one gather instead of one-at-a-time, so the
+    per-email LLM latency overlaps and Qdrant sees writes close together."""
+    # Lazy so the LLM/vector stack loads on first webhook, not at boot
+    from src.core.use_cases import process_new_emails_batch
+
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < BATCH_MAX:
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=BATCH_WINDOW))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            # One row-marshaled LLM call for the whole batch, then per-email
+            # ingest; member failures are handled inside.
+            await process_new_emails_batch(batch)
+        except Exception as e:
+            logger.error(f"❌ Failed to process email batch: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One VectorService per worker process: connection setup (gRPC channel,
+    # collection/index checks) happens at startup, not on the first request.
+    app.state.vs = get_vector_service()
+    # Single batching consumer: webhook handlers just enqueue and return,
+    # so slow LLM/Qdrant calls never block the request path.
+    app.state.email_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+    app.state.email_consumer = asyncio.create_task(_email_consumer(app.state.email_queue))
+    yield
+    # Let queued emails finish, then stop the consumer.
+    await app.state.email_queue.join()
+    app.state.email_consumer.cancel()
+    await asyncio.gather(app.state.email_consumer, return_exceptions=True)
+
+app = FastAPI(title="Nutshell.io API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # welcome endpoint
 @app.get("/")
@@ -34,56 +93,64 @@ async def health_check():
 
 # This is the main webhook endpoint that Postmark/Nylas will call when a new email arrives.
 @app.post("/webhooks/inbound-email")
-async def handle_inbound_email(request: Request, background_tasks: BackgroundTasks):
+async def handle_inbound_email(request: Request):
     """
     Endpoint for Postmark/Nylas to POST new email content.
-    We use BackgroundTasks to return a 200 OK immediately and process the AI logic in the background.
+    We enqueue the payload and return a 200 OK immediately; the worker pool
+    does the heavy LLM/Vector work off the request path.
     """
-    logger.info("📬 Received new inbound email webhook. Offloading to background task...")
-    raw_payload = await request.json()
-    
-    # We offload the heavy LLM/Vector work to the background
-    background_tasks.add_task(process_new_email, raw_payload)
+    logger.info("📬 Received new inbound email webhook. Enqueueing for workers...")
+    # orjson parses the raw bytes in C — large HTML email bodies stop
+    # costing stdlib-json time on the event loop
+    raw_payload = orjson.loads(await request.body())
 
-    return {"status": "received", "message": "Email processing started in background"}
+    # Blocks only when the queue is full — explicit backpressure on bursts
+    await request.app.state.email_queue.put(raw_payload)
+
+    return {"status": "received", "message": "Email queued for processing"}
 
 # endpoint to query insights
 @app.get("/api/v1/insights")
 async def get_insights(
+    request: Request,
     limit: int = Query(50, ge=1, le=100),
-    category: Optional[str] = None,
+    category: Optional[List[str]] = Query(None),
     min_relevance: Optional[int] = Query(None, ge=1, le=10),
-    tag: Optional[str] = None,
-    company: Optional[str] = None
+    tag: Optional[List[str]] = Query(None),
+    company: Optional[List[str]] = Query(None)
 ):
     """
     Retrieve insights with optional filtering.
-    
+
     - **limit**: Maximum number of insights to return (1-100)
-    - **category**: Filter by category (e.g., 'Model Release', 'Open Source')
+    - **category**: Filter by categories, OR-ed (e.g., 'Model Release', 'Open Source')
     - **min_relevance**: Minimum relevance score (1-10)
-    - **tag**: Filter by tag (e.g., 'LLM', 'OpenAI')
-    - **company**: Filter by company mentioned
+    - **tag**: Filter by tags, OR-ed (e.g., 'LLM', 'OpenAI')
+    - **company**: Filter by companies mentioned, OR-ed
+
+    Repeat a param to OR values in one round-trip, e.g. `?tag=LLM&tag=OpenAI`.
     """
     try:
-        vector_service = VectorService()
-        
-        # Build filter conditions
+        vector_service = request.app.state.vs
+
+        # Build filter conditions; MatchAny ORs the values of each param
+        # within a single Qdrant query.
+        from qdrant_client import models
         filter_conditions = []
         if category:
-            filter_conditions.append({"key": "category", "match": {"value": category}})
+            filter_conditions.append(models.FieldCondition(key="category", match=models.MatchAny(any=category)))
         if min_relevance:
-            filter_conditions.append({"key": "relevance_score", "range": {"gte": min_relevance}})
+            filter_conditions.append(models.FieldCondition(key="relevance_score", range=models.Range(gte=min_relevance)))
         if tag:
-            filter_conditions.append({"key": "tags", "match": {"any": [tag]}})
+            filter_conditions.append(models.FieldCondition(key="tags", match=models.MatchAny(any=tag)))
         if company:
-            filter_conditions.append({"key": "companies_mentioned", "match": {"any": [company]}})
-        
-        # Query with filters
-        from qdrant_client import models
+            filter_conditions.append(models.FieldCondition(key="companies_mentioned", match=models.MatchAny(any=company)))
+
         query_filter = models.Filter(must=filter_conditions) if filter_conditions else None
         
-        points, _ = vector_service.client.scroll(
+        # Async client keeps the event loop free for the Qdrant round-trip;
+        # the sync client here would stall every concurrent request.
+        points, _ = await vector_service.aclient.scroll(
             collection_name=vector_service.collection_name,
             scroll_filter=query_filter,
             with_payload=True,
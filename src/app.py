@@ -5,9 +5,11 @@ The app features a sidebar for controls and a main feed that highlights trending
 """
 
 import streamlit as st
+import pandas as pd
 from qdrant_client import QdrantClient, models
 from dotenv import load_dotenv
 import asyncio
+import html
 import os
 import sys
 
@@ -18,11 +20,25 @@ load_dotenv()
 
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "nutshell")
 
+# Only the fields the feed actually renders — slicing the payload server-side
+# cuts scroll bandwidth and per-point dict allocation.
+FEED_FIELDS = [
+    "headline", "summary", "tags", "companies_mentioned", "key_people",
+    "links", "mention_count", "relevance_score", "category",
+    "first_seen", "last_seen", "sources",
+]
+FACET_FIELDS = ["category", "tags", "companies_mentioned"]
+
+# Pill templates bound once; payload values are escaped before interpolation
+TAG_TPL = "<span class='tag-pill'>{}</span>".format
+COMPANY_TPL = "<span class='company-pill'>{}</span>".format
+
 # Page Config
 st.set_page_config(page_title="Nutshell.io | AI Intelligence", layout="wide", page_icon="🥜")
 
-# Styling
-st.markdown("""
+# Styling — the CSS literal is parsed once at import; the markdown call
+# must still run every rerun or the styles vanish from the rebuilt page.
+_CSS = """
     <style>
     .news-card {
         padding: 20px;
@@ -58,22 +74,54 @@ st.markdown("""
         display: inline-block;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+def _inject_css():
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+_inject_css()
 
 # ─────────────────────────────────────────────
 # Qdrant Client
 # ─────────────────────────────────────────────
 @st.cache_resource
 def get_qdrant_client():
-    return QdrantClient(host="localhost", port=6333)
+    # gRPC channel (reused across reruns): protobuf framing beats HTTP+JSON
+    # on RTT and parse cost for the small scrolls this app issues.
+    return QdrantClient(host="localhost", port=6333, grpc_port=6334, prefer_grpc=True, timeout=30)
 
 client = get_qdrant_client()
 
+# Sidebar radio label -> indexed payload field used for server-side ordering
+SORT_FIELDS = {
+    "Trending (Mentions)": "mention_count",
+    "Relevance Score": "relevance_score",
+    "Recent": "first_seen",
+}
+
+@st.cache_resource
+def _ensure_sort_indexes():
+    """Payload indexes backing Qdrant order_by; created once, idempotent."""
+    for field, schema in (
+        ("mention_count", "integer"),
+        ("relevance_score", "integer"),
+        ("first_seen", "datetime"),
+    ):
+        try:
+            client.create_payload_index(COLLECTION_NAME, field_name=field, field_schema=schema)
+        except Exception:
+            pass  # index already exists or Qdrant is down; scroll will surface the latter
+
+_ensure_sort_indexes()
+
 # ─────────────────────────────────────────────
 # Data Fetching
 # ─────────────────────────────────────────────
-def get_all_nutshells(category_filter=None, min_relevance=None, tag_filter=None, company_filter=None):
-    """Fetch insights with optional filters."""
+@st.cache_data(ttl=60, show_spinner=False, max_entries=32)
+def get_all_nutshells(category_filter=None, min_relevance=None, tag_filter=None, company_filter=None, sort_field=None):
+    """Fetch insights with optional filters, ordered server-side by Qdrant.
+    Memoized per filter tuple so reruns with unchanged filters skip the
+    Qdrant round-trip."""
     filter_conditions = []
     
     if category_filter and category_filter != "All":
@@ -90,29 +138,44 @@ def get_all_nutshells(category_filter=None, min_relevance=None, tag_filter=None,
     points, _ = client.scroll(
         collection_name=COLLECTION_NAME,
         scroll_filter=query_filter,
-        with_payload=True,
-        limit=100
+        with_payload=FEED_FIELDS,
+        limit=100,
+        order_by=models.OrderBy(key=sort_field, direction=models.Direction.DESC) if sort_field else None
     )
     return [p.payload for p in points]
 
-def get_unique_values(field: str):
-    """Get unique values for a field across all insights."""
-    try:
-        points, _ = client.scroll(
+def _scroll_all(scroll_filter=None, fields=None, page_size=256):
+    """Stream every payload in the collection via cursor pagination.
+    Small pages follow next_page_offset until exhausted, so aggregations
+    stay correct past any fixed limit and huge single scrolls (and their
+    timeouts) are avoided."""
+    offset = None
+    while True:
+        points, offset = client.scroll(
             collection_name=COLLECTION_NAME,
-            with_payload=True,
-            limit=100
+            scroll_filter=scroll_filter,
+            with_payload=fields if fields is not None else True,
+            limit=page_size,
+            offset=offset
         )
-        values = set()
-        for p in points:
-            if field in p.payload:
-                if isinstance(p.payload[field], list):
-                    values.update(p.payload[field])
-                else:
-                    values.add(p.payload[field])
-        return sorted(list(values))
+        yield from (p.payload for p in points)
+        if offset is None:
+            break
+
+@st.cache_data(ttl=120, show_spinner=False)
+def get_facets():
+    """Build all sidebar facet lists (categories, tags, companies) in one
+    pass over the whole collection instead of one round-trip per facet."""
+    categories, tags, companies = set(), set(), set()
+    try:
+        for payload in _scroll_all(fields=FACET_FIELDS):
+            if payload.get("category"):
+                categories.add(payload["category"])
+            tags.update(payload.get("tags", []))
+            companies.update(payload.get("companies_mentioned", []))
     except Exception:
-        return []
+        return [], [], []
+    return sorted(categories), sorted(tags), sorted(companies)
 
 # ─────────────────────────────────────────────
 # Pipeline Step Functions
@@ -142,8 +205,9 @@ def step2_fetch_emails():
         if not newsletters:
             return False, "📭 No new newsletters found in inbox."
 
-        # Filter out already processed
-        new_emails = [nl for nl in newsletters if not tracker.is_processed(nl['id'])]
+        # Filter out already processed — one query, then set membership
+        processed = tracker.processed_ids()
+        new_emails = [nl for nl in newsletters if nl['id'] not in processed]
         already_processed = len(newsletters) - len(new_emails)
 
         # Store in session state for Step 3
@@ -160,7 +224,7 @@ def step2_fetch_emails():
 def step3_process_and_store():
     """Step 3: Run LLM extraction + store in Qdrant."""
     try:
-        from src.core.use_cases import process_new_email
+        from src.core.use_cases import process_new_emails_batch
         from src.adapters.email_tracker import EmailTracker
 
         tracker = EmailTracker()
@@ -169,28 +233,42 @@ def step3_process_and_store():
         if not pending:
             return False, "⚠️ No pending emails to process. Please run Step 2 first."
 
-        success_count = 0
-        failed_count = 0
-        results = []
-
-        for nl in pending:
-            payload = {
+        def to_payload(nl):
+            return {
                 "TextBody": nl['body'],
                 "From": nl['from'],
                 "Subject": nl['subject'],
                 "MessageID": nl['id'],
                 "date": str(nl.get('date', ''))
             }
-            try:
-                asyncio.run(process_new_email(payload))
+
+        # Batched extraction + serial ingest: running whole emails
+        # concurrently races the duplicate check (double inserts,
+        # clobbered merges), so only the LLM phase overlaps.
+        outcomes = asyncio.run(
+            process_new_emails_batch([to_payload(nl) for nl in pending])
+        )
+
+        success_count = 0
+        failed_count = 0
+        results = []
+
+        for nl, outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                failed_count += 1
+                results.append(f"  ❌ {nl['subject']}: {str(outcome)}")
+            elif outcome:
+                # Some insights failed to store — leave the email unmarked
+                # so a later run retries it; re-ingesting merges cleanly
+                failed_count += 1
+                results.append(f"  ⚠️ {nl['subject']}: {len(outcome)} insights not stored (will retry)")
+            else:
                 tracker.mark_processed(nl['id'])
                 success_count += 1
                 results.append(f"  ✅ {nl['subject']}")
-            except Exception as e:
-                failed_count += 1
-                results.append(f"  ❌ {nl['subject']}: {str(e)}")
 
-        # Clear pending after processing
+        # Persist batched tracker marks and clear pending after processing
+        tracker.flush()
         st.session_state['pending_emails'] = []
 
         details = "\n".join(results)
@@ -257,7 +335,9 @@ with st.sidebar:
         if ok:
             st.success(msg)
             st.balloons()
-            st.cache_data.clear()
+            # New insights landed: refresh the feed and facet caches only
+            get_all_nutshells.clear()
+            get_facets.clear()
         else:
             st.error(msg)
 
@@ -266,16 +346,15 @@ with st.sidebar:
     # ── Filters ───────────────────────────────
     st.header("🎛️ Filters")
     
-    categories = ["All"] + get_unique_values("category")
-    category_filter = st.selectbox("Category", categories, index=0)
-    
+    facet_categories, facet_tags, facet_companies = get_facets()
+
+    category_filter = st.selectbox("Category", ["All"] + facet_categories, index=0)
+
     min_relevance = st.slider("Min Relevance Score", 1, 10, 1)
-    
-    all_tags = ["All"] + get_unique_values("tags")
-    tag_filter = st.selectbox("Tag", all_tags, index=0)
-    
-    all_companies = ["All"] + get_unique_values("companies_mentioned")
-    company_filter = st.selectbox("Company", all_companies, index=0)
+
+    tag_filter = st.selectbox("Tag", ["All"] + facet_tags, index=0)
+
+    company_filter = st.selectbox("Company", ["All"] + facet_companies, index=0)
 
     st.divider()
 
@@ -283,103 +362,146 @@ with st.sidebar:
 
     st.divider()
 
-    if st.button("🔄 Refresh Feed", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
-
     st.info("📡 Monitoring: TLDR, The Neuron, TAAFT, What's AI")
 
 # ─────────────────────────────────────────────
 # Main Feed
 # ─────────────────────────────────────────────
-nutshells = get_all_nutshells(
-    category_filter=category_filter if category_filter != "All" else None,
-    min_relevance=min_relevance if min_relevance > 1 else None,
-    tag_filter=tag_filter if tag_filter != "All" else None,
-    company_filter=company_filter if company_filter != "All" else None
-)
-
-if not nutshells:
-    st.warning("⚠️ No intelligence matching your filters. Try adjusting filters or run the pipeline!")
-    st.info("👈 Use the **Pipeline Controls** in the sidebar to fetch and process newsletters.")
-else:
-    if sort_by == "Trending (Mentions)":
-        sorted_news = sorted(nutshells, key=lambda x: x.get('mention_count', 1), reverse=True)
-    elif sort_by == "Relevance Score":
-        sorted_news = sorted(nutshells, key=lambda x: x.get('relevance_score', 0), reverse=True)
-    else:
-        sorted_news = sorted(nutshells, key=lambda x: x.get('first_seen', ''), reverse=True)
+def _render_card(item):
+    """Full card view for one insight, shown when its feed row is selected."""
+    with st.container():
+        col1, col2 = st.columns([3, 1])
 
-    st.subheader(f"📰 {len(sorted_news)} Insights Found")
+        with col1:
+            st.subheader(item.get('headline', 'Untitled Update'))
+            st.write(item.get('summary', 'No summary available.'))
+
+            # Tags + companies in one markdown delta each, escaped
+            item_tags = item.get('tags', [])
+            if item_tags:
+                tags_html = " ".join(map(TAG_TPL, map(html.escape, item_tags)))
+                st.markdown(f"**Tags:**<br>{tags_html}", unsafe_allow_html=True)
+
+            item_companies = item.get('companies_mentioned', [])
+            if item_companies:
+                companies_html = " ".join(map(COMPANY_TPL, map(html.escape, item_companies)))
+                st.markdown(f"**Companies:**<br>{companies_html}", unsafe_allow_html=True)
+
+            # Key People
+            key_people = item.get('key_people', [])
+            if key_people:
+                st.markdown(f"**Key People:** {', '.join(key_people)}")
+
+            # Sources/Links — one markdown call for the whole list
+            links = item.get('links', [])
+            if links:
+                links_md = "\n".join(f"- [Source {i}]({link})" for i, link in enumerate(links, 1))
+                st.markdown(f"**Sources:**\n{links_md}")
+
+            # First seen / Last seen
+            first_seen = item.get('first_seen', '')
+            last_seen = item.get('last_seen', '')
+            if first_seen:
+                st.caption(f"🕐 First seen: `{first_seen}` | Last seen: `{last_seen}`")
 
-    for item in sorted_news:
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                st.subheader(item.get('headline', 'Untitled Update'))
-                st.write(item.get('summary', 'No summary available.'))
-
-                # Tags
-                item_tags = item.get('tags', [])
-                if item_tags:
-                    st.markdown("**Tags:**")
-                    tags_html = " ".join([f"<span class='tag-pill'>{tag}</span>" for tag in item_tags])
-                    st.markdown(tags_html, unsafe_allow_html=True)
-
-                # Companies
-                item_companies = item.get('companies_mentioned', [])
-                if item_companies:
-                    st.markdown("**Companies:**")
-                    companies_html = " ".join([f"<span class='company-pill'>{comp}</span>" for comp in item_companies])
-                    st.markdown(companies_html, unsafe_allow_html=True)
-
-                # Key People
-                key_people = item.get('key_people', [])
-                if key_people:
-                    st.markdown(f"**Key People:** {', '.join(key_people)}")
-
-                # Sources/Links
-                links = item.get('links', [])
-                if links:
-                    st.markdown("**Sources:**")
-                    for i, link in enumerate(links, 1):
-                        st.markdown(f"- [Source {i}]({link})")
-
-                # First seen / Last seen
-                first_seen = item.get('first_seen', '')
-                last_seen = item.get('last_seen', '')
-                if first_seen:
-                    st.caption(f"🕐 First seen: `{first_seen}` | Last seen: `{last_seen}`")
-
-            with col2:
-                mentions = item.get('mention_count', 1)
-                st.markdown(f"<span class='mention-badge'>🔥 {mentions} Mentions</span>", unsafe_allow_html=True)
-                st.metric("Relevance", f"{item.get('relevance_score', 0)}/10")
-                st.write(f"🏷️ `{item.get('category', 'General')}`")
-
-                # Show all sources
-                sources = item.get('sources', [])
-                if sources:
-                    st.caption("📬 Seen in:")
+        with col2:
+            mentions = item.get('mention_count', 1)
+            st.markdown(f"<span class='mention-badge'>🔥 {mentions} Mentions</span>", unsafe_allow_html=True)
+            st.metric("Relevance", f"{item.get('relevance_score', 0)}/10")
+            st.write(f"🏷️ `{item.get('category', 'General')}`")
+
+            # Show all sources ({subject: {email, date}}; older points
+            # may still carry the list-of-dicts shape)
+            sources = item.get('sources', {})
+            if sources:
+                st.caption("📬 Seen in:")
+                if isinstance(sources, dict):
+                    for subject in sources:
+                        st.caption(f"  - {subject}")
+                else:
                     for s in sources:
                         if isinstance(s, dict):
                             st.caption(f"  - {s.get('subject', 'Unknown')}")
 
-            st.divider()
+@st.fragment
+def render_feed(category_filter, min_relevance, tag_filter, company_filter, sort_by):
+    """Feed as a fragment: refreshing reruns only this container, not the
+    whole script (sidebar facets, CSS injection, pipeline controls)."""
+    if st.button("🔄 Refresh Feed"):
+        # Drop only the feed cache; facets and other cached data stay warm
+        get_all_nutshells.clear()
+
+    nutshells = get_all_nutshells(
+        category_filter=category_filter if category_filter != "All" else None,
+        min_relevance=min_relevance if min_relevance > 1 else None,
+        tag_filter=tag_filter if tag_filter != "All" else None,
+        company_filter=company_filter if company_filter != "All" else None,
+        sort_field=SORT_FIELDS[sort_by]
+    )
+
+    if not nutshells:
+        st.warning("⚠️ No intelligence matching your filters. Try adjusting filters or run the pipeline!")
+        st.info("👈 Use the **Pipeline Controls** in the sidebar to fetch and process newsletters.")
+        return
+
+    # Already ordered by Qdrant via order_by on the indexed sort field.
+    # Normalize missing keys once so the table and card views never fall
+    # back to per-access .get defaults (cache_data hands us a copy, so
+    # mutating here is safe).
+    for n in nutshells:
+        n.setdefault('mention_count', 1)
+        n.setdefault('relevance_score', 0)
+        n.setdefault('first_seen', '')
+        n.setdefault('category', 'General')
+    sorted_news = nutshells
+
+    st.subheader(f"📰 {len(sorted_news)} Insights Found")
 
-    # Stats
+    # Single virtualized dataframe delta instead of ~10 widget messages per
+    # card; selecting a row expands it to the full card view below.
+    df = pd.DataFrame(sorted_news)
+    for col in ("headline", "summary", "category", "relevance_score", "mention_count"):
+        if col not in df.columns:
+            df[col] = None
+    df["link"] = [(item.get('links') or [None])[0] for item in sorted_news]
+
+    event = st.dataframe(
+        df[["headline", "summary", "category", "relevance_score", "mention_count", "link"]],
+        column_config={
+            "headline": st.column_config.TextColumn("Headline", width="large"),
+            "summary": st.column_config.TextColumn("Summary", width="large"),
+            "category": st.column_config.TextColumn("Category"),
+            "relevance_score": st.column_config.ProgressColumn("Relevance", min_value=0, max_value=10, format="%d/10"),
+            "mention_count": st.column_config.NumberColumn("🔥 Mentions"),
+            "link": st.column_config.LinkColumn("Top Source", display_text="open"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        height=700,
+        on_select="rerun",
+        selection_mode="single-row",
+    )
+
+    selected_rows = event.selection.rows if event else []
+    if selected_rows:
+        st.divider()
+        _render_card(sorted_news[selected_rows[0]])
+
+    # Stats — computed on the frame already built for the feed render,
+    # one vectorized pass instead of four Python scans over the dicts
     with st.expander("📊 Quick Stats"):
+        avg_relevance = df["relevance_score"].fillna(0).mean() if len(df) else 0
+        trending_count = int((df["mention_count"].fillna(1) > 1).sum())
+        unique_categories = df["category"].fillna("General").nunique()
+
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Insights", len(sorted_news))
+            st.metric("Total Insights", len(df))
         with col2:
-            avg_relevance = sum(n.get('relevance_score', 0) for n in sorted_news) / len(sorted_news) if sorted_news else 0
             st.metric("Avg Relevance", f"{avg_relevance:.1f}/10")
         with col3:
-            trending_count = len([n for n in sorted_news if n.get('mention_count', 1) > 1])
             st.metric("Trending Items", trending_count)
         with col4:
-            unique_categories = len(set(n.get('category', 'General') for n in sorted_news))
             st.metric("Categories", unique_categories)
-            
\ No newline at end of file
+
+render_feed(category_filter, min_relevance, tag_filter, company_filter, sort_by)
@@ -0,0 +1,71 @@
+"""
+Pre-filters raw newsletter bodies before they reach the LLM.
+Nylas hands us the full HTML body; <style>/<script> blocks, tracking markup,
+and footer boilerplate ("unsubscribe", "view in browser", ...) would
+otherwise be paid for as input tokens and inflate the chunk count.
+Stripping happens here with the stdlib html.parser so no extra dependency
+is needed.
+"""
+import re
+from html.parser import HTMLParser
+
+# Subtrees whose text content is never visible to the reader
+_SKIPPED_TAGS = {"style", "script", "head", "title", "template"}
+
+# Block-level tags that imply a line break in the visible text
+_BLOCK_TAGS = {"br", "p", "div", "tr", "li", "table", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "section", "article"}
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text, skipping style/script subtrees."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+# Footer/boilerplate lines that carry no news content
+_BOILERPLATE_RE = re.compile(
+    r"^.*(unsubscribe|view (this email )?in (your )?browser|privacy policy|"
+    r"manage (your )?preferences|update your (email )?preferences|"
+    r"sent to [^\s]+@|no longer wish to receive).*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_TRAILING_WS_RE = re.compile(r"[ \t]+\n")
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+
+def clean_email_body(body: str) -> str:
+    """
+    Reduce a raw email body to clean visible text:
+    1. Strip HTML markup (keeping line breaks at block boundaries)
+    2. Drop footer boilerplate lines
+    3. Collapse whitespace so the chunker sees clean paragraph separators
+    """
+    if "<" in body and ">" in body:
+        parser = _TextExtractor()
+        try:
+            parser.feed(body)
+            parser.close()
+            text = "".join(parser.parts)
+        except Exception:
+            # Malformed HTML: better to pay the extra tokens than lose the email
+            text = body
+    else:
+        text = body
+
+    text = _BOILERPLATE_RE.sub("", text)
+    text = _TRAILING_WS_RE.sub("\n", text)
+    text = _EXCESS_NEWLINES_RE.sub("\n\n", text)
+    return text.strip()
@@ -7,15 +7,122 @@ If not, it adds a new insight to the vector store.
 This file serves as the central place for the main business logic of how incoming newsletter content is processed and stored.
 """
 
-from src.adapters.llm import extract_digest_from_text
+from src.adapters.llm import extract_digest_from_text, extract_digests_batch
 from src.adapters.vector_store import VectorService
-from src.core.entities import NewsletterDigest
+from src.core.entities import IntelligenceNode, NewsletterDigest
+from src.core.preprocess import clean_email_body
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+import asyncio
+import logging
+import re
 
 from utils.logging_setup import get_logger
 logger = get_logger(__name__, log_file="core.log")
 
-vs = VectorService()
+# Lazy per-event-loop VectorService: importing this module stays free of
+# Qdrant connections and collection checks, and the async gRPC channel
+# binds to the loop it first runs on — Streamlit's "Process & Store"
+# button creates a fresh loop per click via asyncio.run, so one cached
+# instance would resurface a channel bound to a closed loop.
+_services: dict = {}
+
+def _vs() -> VectorService:
+    loop = asyncio.get_running_loop()
+    vs = _services.get(loop)
+    if vs is None:
+        # Drop services whose loop has closed; their channels are dead
+        for stale in [l for l in _services if l.is_closed()]:
+            del _services[stale]
+        vs = _services[loop] = VectorService()
+    return vs
+
+# Headline normalization for within-email dedup: lowercase, strip
+# punctuation, collapse whitespace
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_WS_RE = re.compile(r"\s+")
+
+def _normalize_headline(headline: str) -> str:
+    return _WS_RE.sub(" ", _PUNCT_RE.sub("", headline.lower())).strip()
+
+def _dedupe_insights(insights: list) -> list:
+    """
+    Merge repeats of the same story within one email (top-of-fold plus
+    section recap is common) before anything is embedded or searched:
+    list fields union, relevance takes the max, first occurrence wins
+    for headline/summary.
+    """
+    merged = {}
+    for insight in insights:
+        key = _normalize_headline(insight.headline)
+        kept = merged.get(key)
+        if kept is None:
+            merged[key] = insight
+            continue
+        kept.links = list(set(kept.links).union(insight.links))
+        kept.tags = list(set(kept.tags).union(insight.tags))
+        kept.companies_mentioned = list(set(kept.companies_mentioned).union(insight.companies_mentioned))
+        kept.key_people = list(set(kept.key_people).union(insight.key_people))
+        kept.relevance_score = max(kept.relevance_score, insight.relevance_score)
+    return list(merged.values())
+
+def _normalize_date(value) -> str:
+    """
+    Coerce the inbound date shapes — Nylas epoch seconds, RFC 2822 headers,
+    ISO strings, datetimes — to RFC 3339. first_seen/last_seen only enter
+    Qdrant's datetime payload index (which "Recent" sorting relies on) if
+    they parse as datetimes, so this must happen at ingest.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    text = str(value).strip()
+    try:
+        # Nylas delivers epoch seconds; a bare number is never a calendar date
+        return datetime.utcfromtimestamp(float(text)).isoformat()
+    except (ValueError, OverflowError, OSError):
+        pass
+    try:
+        return datetime.fromisoformat(text).isoformat()
+    except ValueError:
+        pass
+    try:
+        # RFC 2822 Date headers from the webhook path
+        return parsedate_to_datetime(text).isoformat()
+    except (TypeError, ValueError):
+        pass
+    logger.debug(f"Unparseable email date {text!r}; stamping current time")
+    return datetime.utcnow().isoformat()
+
+def parse_payload(payload: dict):
+    """
+    Extract the cleaned email body and source metadata from a raw webhook
+    payload (handles both Postmark and Nylas formats).
+    Returns (email_body, source_metadata), or None if there is nothing to process.
+    """
+    email_body = payload.get("TextBody", payload.get("body", ""))
+
+    if not email_body:
+        logger.warning("⚠️ Empty email body, skipping")
+        return None
+
+    # Strip HTML noise and footer boilerplate before the LLM sees it —
+    # fewer input tokens and fewer chunks for HTML newsletters
+    email_body = clean_email_body(email_body)
+    if not email_body:
+        logger.warning("⚠️ Email body empty after HTML cleanup, skipping")
+        return None
+
+    # Extract email metadata (source, subject, date)
+    email_source = payload.get("From", payload.get("from", "unknown@unknown.com"))
+    email_subject = payload.get("Subject", payload.get("subject", "No Subject"))
+    email_date = payload.get("Date", payload.get("date", datetime.utcnow().isoformat()))
+
+    source_metadata = {
+        "email": email_source,
+        "subject": email_subject,
+        "date": _normalize_date(email_date)  # RFC 3339 so it indexes as a datetime
+    }
+    return email_body, source_metadata
 
 async def process_new_email(payload: dict):
     """
@@ -24,119 +131,237 @@ async def process_new_email(payload: dict):
     2. Extract structured digest via LLM
     3. Check for duplicates in vector DB
     4. Merge or insert new insights with full metadata
+    Returns ingest_digest's list of (insight, exception) failures.
     """
-    try:
-        logger.info("📬 Processing new email...")
-        
-        # Extract email body (handle both Postmark and Nylas formats)
-        email_body = payload.get("TextBody", payload.get("body", ""))
-        
-        if not email_body:
-            logger.warning("⚠️ Empty email body, skipping")
-            return
-        
-        # Extract email metadata (source, subject, date)
-        email_source = payload.get("From", payload.get("from", "unknown@unknown.com"))
-        email_subject = payload.get("Subject", payload.get("subject", "No Subject"))
-        email_date = payload.get("Date", payload.get("date", datetime.utcnow().isoformat()))
-        
-        # Create source metadata object
-        source_metadata = {
-            "email": email_source,
-            "subject": email_subject,
-            "date": str(email_date)  # Ensure it's a string
-        }
-        
-        logger.info(f"📧 Processing: '{email_subject}' from {email_source}")
-        
-        logger.info("🤖 Extracting digest from email...")
-        digest = await extract_digest_from_text(email_body)
-        
-        newsletter_digest = digest
-        if not newsletter_digest or not newsletter_digest.insights:
+    logger.info("📬 Processing new email...")
+
+    parsed = parse_payload(payload)
+    if parsed is None:
+        return []
+    email_body, source_metadata = parsed
+    email_subject = source_metadata["subject"]
+
+    logger.info(f"📧 Processing: '{email_subject}' from {source_metadata['email']}")
+
+    logger.info("🤖 Extracting digest from email...")
+    digest = await extract_digest_from_text(email_body)
+
+    if not digest or not digest.insights:
+        logger.warning(f"⚠️ No valid insights extracted from '{email_subject}'. Skipping email.")
+        return []
+
+    logger.info(f"✅ Extracted {len(digest.insights)} insights from '{email_subject}'")
+    return await ingest_digest(digest, source_metadata)
+
+async def process_new_emails_batch(payloads: list) -> list:
+    """
+    Batch path for bursty deliveries: ONE row-marshaled LLM call extracts
+    digests for every body, then each digest is ingested SERIALLY —
+    concurrent ingests race the duplicate check (two same-day emails can
+    both miss it and double-insert a story, or clobber each other's
+    payload merges), so only the extraction phase overlaps.
+
+    Returns one result per payload, aligned with the input: ingest_digest's
+    (insight, exception) failure list ([] = fully stored, or nothing to
+    store), or the exception itself when the email's ingest failed
+    wholesale. Per-email failures never abort the rest of the batch.
+    """
+    results: list = [[] for _ in payloads]
+    parsed = [(idx, parse_payload(p)) for idx, p in enumerate(payloads)]
+    work = [(idx, item) for idx, item in parsed if item is not None]
+    if not work:
+        return results
+
+    logger.info(f"📬 Processing batch of {len(work)} emails in one extraction call...")
+    digests = await extract_digests_batch([body for _, (body, _) in work])
+
+    for (idx, (_, source_metadata)), digest in zip(work, digests):
+        email_subject = source_metadata["subject"]
+        if not digest or not digest.insights:
             logger.warning(f"⚠️ No valid insights extracted from '{email_subject}'. Skipping email.")
-            return
-        
-        logger.info(f"✅ Extracted {len(newsletter_digest.insights)} insights from '{email_subject}'")
-        
-        # Process each insight from the digest
-        for incoming in newsletter_digest.insights:
-            logger.debug(f"Processing insight: {incoming.headline}")
-            
-            # Check for duplicate
-            dup_id = vs.find_duplicate(incoming.headline)
-            
-            if dup_id:
-                logger.info(f"🔍 Found duplicate for headline: {incoming.headline}. Merging insights...")
-
-                # 1. Fetch current state
-                current_payload = vs.get_payload(dup_id)
-                
-                # Merge list fields (tags, companies_mentioned, key_people, links)
-                merged_links = list(dict.fromkeys(current_payload.get("links", []) + incoming.links))
-                merged_tags = list(dict.fromkeys(current_payload.get("tags", []) + incoming.tags))
-                merged_companies = list(dict.fromkeys(current_payload.get("companies_mentioned", []) + incoming.companies_mentioned))
-                merged_people = list(dict.fromkeys(current_payload.get("key_people", []) + incoming.key_people))
-                
-                # Update Sources (Store full source metadata, not just email)
-                sources = current_payload.get("sources", [])
-                source_subjects = [s.get("subject") for s in sources if isinstance(s, dict)]
-                if email_subject not in source_subjects:
-                    sources.append(source_metadata)
-                    logger.debug(f"Added new source: {email_subject}")
-                else:
-                    logger.debug(f"Source already recorded: {email_subject}")
-
-                # Update relevance score (take the max)
-                updated_relevance = max(
-                    current_payload.get('relevance_score', 0),
-                    incoming.relevance_score
-                )
-                
-                # Track first and last seen dates
-                first_seen = current_payload.get("first_seen", email_date)
-                last_seen = email_date
-
-                # Patch the record with merged data
-                vs.patch_payload(dup_id, {
-                    "links": merged_links,
-                    "tags": merged_tags,
-                    "companies_mentioned": merged_companies,
-                    "key_people": merged_people,
-                    "sources": sources,
-                    "mention_count": len(sources), 
-                    "summary": incoming.summary,  # Update with latest summary
-                    "relevance_score": updated_relevance,
-                    "first_seen": first_seen,
-                    "last_seen": last_seen,
-                    "category": incoming.category  # Update category in case it changed
-                })
-                
-                logger.info(f"🔥 Merged insight: {incoming.headline}")
-                logger.info(f"   - Total sources: {len(sources)}")
-                logger.info(f"   - Latest source: '{email_subject}'")
-                logger.info(f"   - Links added: {len(set(incoming.links) - set(current_payload.get('links', [])))}")
-                logger.info(f"   - Relevance: {updated_relevance}/10")
-            else:
-                # New insight logic
-                logger.info(f"✨ New insight found: {incoming.headline}")
-                data = incoming.model_dump()
-                
-                # Add comprehensive metadata
-                data["sources"] = [source_metadata]  # Store full metadata, not just email string
-                data["mention_count"] = 1
-                data["first_seen"] = str(email_date)
-                data["last_seen"] = str(email_date)
-                data["original_subject"] = email_subject  # Track which newsletter first mentioned it
-                
-                vs.upsert_insight(data, incoming.headline)
-                logger.info(f"✅ Added new insight from: '{email_subject}'")
-                logger.info(f"   - Category: {incoming.category}")
-                logger.info(f"   - Relevance: {incoming.relevance_score}/10")
-                logger.info(f"   - Links: {len(incoming.links)}")
-        
+            continue
+        try:
+            results[idx] = await ingest_digest(digest, source_metadata)
+        except Exception as e:
+            # The batched duplicate lookup can still fail wholesale;
+            # per-insight failures come back in the failure list instead
+            logger.error(f"❌ Error ingesting digest for '{email_subject}': {e}", exc_info=True)
+            results[idx] = e
+            continue
+        if results[idx]:
+            logger.warning(f"⚠️ '{email_subject}': {len(results[idx])} insights were not stored")
+
+    return results
+
+def _compile_payload_builder():
+    """
+    Specialize the new-insight payload for the IntelligenceNode schema known
+    at import time: one generated dict literal (field reads plus the ingest
+    metadata) instead of model_dump's generic schema walk followed by five
+    mutations. Regenerates automatically if fields are added to the model.
+    """
+    field_items = ", ".join(f'"{name}": incoming.{name}' for name in IntelligenceNode.model_fields)
+    src = (
+        "def _build_payload(incoming, source_metadata, email_subject, email_date):\n"
+        "    return {" + field_items + ", "
+        '"sources": {email_subject: {"email": source_metadata["email"], "date": str(email_date)}}, '
+        '"mention_count": 1, '
+        '"first_seen": str(email_date), '
+        '"last_seen": str(email_date), '
+        '"original_subject": email_subject}\n'
+    )
+    namespace = {}
+    exec(src, namespace)
+    return namespace["_build_payload"]
+
+_build_payload = _compile_payload_builder()
+
+def _handle_insight(incoming, dup_id, dup_payloads: dict, source_metadata: dict):
+    """
+    Decide what one insight contributes to the batched write: returns
+    ("patch", (point_id, merged_payload)) for a duplicate or
+    ("new", (payload, headline)) for a fresh insight.
+    All its inputs are prefetched, so this is pure in-memory work.
+    """
+    email_subject = source_metadata["subject"]
+    email_date = source_metadata["date"]
+    logger.debug(f"Processing insight: {incoming.headline}")
+
+    if dup_id:
+        logger.info(f"🔍 Found duplicate for headline: {incoming.headline}. Merging insights...")
+
+        # 1. Current state, prefetched above
+        current_payload = dup_payloads.get(dup_id, {})
+
+        # Merge list fields via set union — no ordering contract on
+        # these payload fields, and no concatenated temp list or
+        # per-merge dict allocation as lists grow with mentions
+        merged_links = list(set(current_payload.get("links", ())).union(incoming.links))
+        merged_tags = list(set(current_payload.get("tags", ())).union(incoming.tags))
+        merged_companies = list(set(current_payload.get("companies_mentioned", ())).union(incoming.companies_mentioned))
+        merged_people = list(set(current_payload.get("key_people", ())).union(incoming.key_people))
+
+        # Sources live as {subject: {email, date}} so the seen-before check
+        # is a dict lookup; legacy list-shaped payloads are converted here
+        # and written back with the patch below
+        sources = current_payload.get("sources", {})
+        if isinstance(sources, list):
+            sources = {
+                s.get("subject", "Unknown"): {"email": s.get("email"), "date": s.get("date")}
+                for s in sources if isinstance(s, dict)
+            }
+        if email_subject not in sources:
+            sources[email_subject] = {"email": source_metadata["email"], "date": email_date}
+            logger.debug(f"Added new source: {email_subject}")
+        else:
+            logger.debug(f"Source already recorded: {email_subject}")
+
+        # Update relevance score (take the max)
+        updated_relevance = max(
+            current_payload.get('relevance_score', 0),
+            incoming.relevance_score
+        )
+
+        # Track first and last seen dates
+        first_seen = current_payload.get("first_seen", email_date)
+        last_seen = email_date
+
+        logger.info(f"🔥 Merged insight: {incoming.headline}")
+        logger.info(f"   - Total sources: {len(sources)}")
+        logger.info(f"   - Latest source: '{email_subject}'")
+        if logger.isEnabledFor(logging.INFO):
+            # The set diff is only worth computing if it will be logged
+            logger.info(f"   - Links added: {len(set(incoming.links) - set(current_payload.get('links', [])))}")
+        logger.info(f"   - Relevance: {updated_relevance}/10")
+
+        return "patch", (dup_id, {
+            "links": merged_links,
+            "tags": merged_tags,
+            "companies_mentioned": merged_companies,
+            "key_people": merged_people,
+            "sources": sources,
+            "mention_count": len(sources),
+            "summary": incoming.summary,  # Update with latest summary
+            "relevance_score": updated_relevance,
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "category": incoming.category  # Update category in case it changed
+        })
+
+    # New insight logic — payload built by the specialized builder, which
+    # already folds in the ingest metadata (sources, counts, seen dates)
+    logger.info(f"✨ New insight found: {incoming.headline}")
+    data = _build_payload(incoming, source_metadata, email_subject, email_date)
+
+    logger.info(f"   - Category: {incoming.category}")
+    logger.info(f"   - Relevance: {incoming.relevance_score}/10")
+    logger.info(f"   - Links: {len(incoming.links)}")
+    return "new", (data, incoming.headline)
+
+async def ingest_digest(newsletter_digest: NewsletterDigest, source_metadata: dict) -> list:
+    """
+    Store one extracted digest: check each insight for duplicates, merge
+    into existing points or buffer for a single batched upsert.
+
+    Failures are isolated per insight instead of aborting the whole email:
+    returns a list of (insight, exception) pairs for anything that could
+    not be stored, so callers can retry or dead-letter just those. The
+    rest of the (already paid-for) LLM output lands in Qdrant regardless.
+    """
+    email_subject = source_metadata["subject"]
+    email_date = source_metadata["date"]
+    vs = _vs()
+    failed = []
+
+    # Collapse within-email repeats first; only survivors cost an
+    # embedding and a duplicate search
+    insights = _dedupe_insights(newsletter_digest.insights)
+    if len(insights) < len(newsletter_digest.insights):
+        logger.info(
+            f"🧹 Collapsed {len(newsletter_digest.insights) - len(insights)} within-email duplicate insights"
+        )
+
+    # Buffer all writes — patches for merged duplicates and new inserts —
+    # so the email lands in Qdrant with one batched update
+    new_insights = []
+    patches = []
+    buffered = []  # insights behind the buffered writes, for failure reporting
+
+    # One batched duplicate check, then one batched payload fetch for
+    # every hit — ~3 Qdrant round-trips for the whole email
+    dup_ids = await vs.find_duplicates_batch([i.headline for i in insights])
+    dup_payloads = await vs.get_payloads_batch([d for d in dup_ids if d])
+
+    # Process each insight from the digest; one bad insight is recorded
+    # and skipped, not allowed to sink its siblings
+    for incoming, dup_id in zip(insights, dup_ids):
+        try:
+            op, payload = _handle_insight(incoming, dup_id, dup_payloads, source_metadata)
+        except Exception as e:
+            logger.error(f"❌ Failed to process insight '{incoming.headline}': {e}", exc_info=True)
+            failed.append((incoming, e))
+            continue
+        if op == "patch":
+            patches.append(payload)
+        else:
+            new_insights.append(payload)
+        buffered.append(incoming)
+
+    # One batched Qdrant write for every patch and insert in this email
+    if new_insights or patches:
+        try:
+            await vs.apply_updates_batch(patches, new_insights)
+            logger.info(
+                f"✅ Wrote {len(new_insights)} new + {len(patches)} merged insights from '{email_subject}' in one batch"
+            )
+        except Exception as e:
+            logger.error(f"❌ Batched write failed for '{email_subject}': {e}", exc_info=True)
+            failed.extend((incoming, e) for incoming in buffered)
+
+    if failed:
+        logger.warning(
+            f"⚠️ {len(failed)}/{len(insights)} insights from '{email_subject}' failed and were returned to the caller"
+        )
+    else:
         logger.info(f"🎉 Email processing complete for '{email_subject}'")
-        
-    except Exception as e:
-        logger.error(f"❌ Error processing email '{email_subject}': {e}", exc_info=True)
-        raise  # Re-raise to let caller handle
\ No newline at end of file
+    return failed
\ No newline at end of file
@@ -1,46 +1,69 @@
 """
-This module sets up a standardized logging configuration for the Nutshell.io application. 
+This module sets up a standardized logging configuration for the Nutshell.io application.
 It defines a get_logger function that can be used across different modules to create loggers with both console and optional file handlers.
+File logs rotate instead of truncating on start, and are buffered in memory
+so the per-insight log chatter costs one write() per few hundred records
+rather than one syscall per line (errors flush immediately).
 """
 
 import logging
 import sys
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
 
+_MAX_BYTES = 10_000_000     # Rotate each log file at ~10MB
+_BACKUP_COUNT = 3           # Keep three rotated generations
+_BUFFER_CAPACITY = 512      # Records buffered before a bulk flush to disk
+
+_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# One buffered handler per file, shared by every logger that targets it —
+# separate handlers on the same path would fight over rotation.
+_file_handlers: dict = {}
+
+def _buffered_file_handler(log_file: str, level) -> MemoryHandler:
+    handler = _file_handlers.get(log_file)
+    if handler is None:
+        log_dir = Path("logs")
+        log_dir.mkdir(parents=True, exist_ok=True)
+        target = RotatingFileHandler(log_dir / log_file, maxBytes=_MAX_BYTES, backupCount=_BACKUP_COUNT)
+        target.setLevel(level)
+        target.setFormatter(_FORMATTER)
+        # ERROR and above flush the buffer immediately; logging.shutdown()
+        # flushes whatever remains at exit.
+        handler = MemoryHandler(capacity=_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=target)
+        handler.setLevel(level)
+        _file_handlers[log_file] = handler
+    return handler
+
 def get_logger(name: str, log_file: str = None, level=logging.DEBUG):
     """
-    Returns a logger with console + optional file handler.
-    
+    Returns a logger with console + optional buffered file handler.
+
     Args:
         name: Logger name (usually __name__)
         log_file: Optional filename in logs/ dir (e.g., "adapters.log")
         level: Logging level
     """
     logger = logging.getLogger(name)
-    
+
     # Avoid adding duplicate handlers if called multiple times
     if logger.hasHandlers():
         return logger
-    
+
     logger.setLevel(level)
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
-    
-    # File handler (if specified)
+
+    # File handler (if specified): rotating, memory-buffered, shared per file
     if log_file:
-        log_dir = Path("logs")
-        log_dir.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_dir / log_file, mode='w')  # 'a' for append
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
-    return logger
\ No newline at end of file
+        logger.addHandler(_buffered_file_handler(log_file, level))
+
+    return logger